@@ -12,51 +12,170 @@ Usage:
     python dashboard.py                    # Default: port 5555
     python dashboard.py --port 8888        # Custom port
     python dashboard.py --mock             # Mock data for UI development
+    python dashboard.py --dev              # Flask dev server instead of gunicorn
+                                           # (also used when gunicorn is missing)
 """
 
 import argparse
-import json
+import atexit
+import hashlib
+import math
 import os
+import random
 import sqlite3
+import sys
 import threading
 import time
-from collections import deque
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from flask import Flask, jsonify, render_template, request, send_from_directory
+from flask import (Flask, Response, jsonify, render_template, request,
+                   send_from_directory, stream_with_context)
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    print("ERROR: orjson not installed. Run: pip install orjson")
+    sys.exit(1)
+
+try:
+    import xxhash
+    _HAS_XXHASH = True
+except ImportError:
+    _HAS_XXHASH = False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Route jsonify() and request.get_json() through orjson."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__,
             template_folder='templates',
             static_folder='static')
+app.json = OrjsonProvider(app)
 
 # Paths
 STATE_FILE = Path(__file__).parent.parent / "mesh_state.json"
 DB_FILE = Path(__file__).parent / "mesh_data.db"
 COMMAND_FILE = Path(__file__).parent.parent / "mesh_commands.json"
 
-# Console log buffer (in-memory ring buffer for the UI)
-_console_log = deque(maxlen=500)
+# Console log buffer (ring; slots hold (seq, entry) pairs). Appends are
+# serialized so the head only moves forward; readers never take the lock.
+CONSOLE_LOG_SIZE = 500
+_console_ring = [None] * CONSOLE_LOG_SIZE
 _console_lock = threading.Lock()
+_console_head = 0                   # one past the newest published seq
+
+
+def _console_append(entry):
+    """Publish one console entry."""
+    global _console_head
+    with _console_lock:
+        seq = _console_head
+        _console_ring[seq % CONSOLE_LOG_SIZE] = (seq, entry)
+        _console_head = seq + 1
 
 # --------------------------------------------------------------------------- #
 #  SQLite helpers
 # --------------------------------------------------------------------------- #
 
+# Two-connection model (WAL): one long-lived writer shared by every thread
+# and serialized by _writer_lock, plus one read-only connection per thread.
+# Readers never contend for the write lock, and writers never hit
+# SQLITE_BUSY against each other.
+_db_local = threading.local()
+_writer_db = None
+_writer_lock = threading.Lock()
+
+DB_WRITER_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA busy_timeout=3000;
+    PRAGMA cache_size=-65536;
+    PRAGMA temp_store=MEMORY;
+"""
+DB_READER_PRAGMAS = """
+    PRAGMA busy_timeout=3000;
+    PRAGMA cache_size=-65536;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+"""
+DB_PAGE_SIZE = 4096
+DB_AUTO_VACUUM_INCREMENTAL = 2  # PRAGMA auto_vacuum value
+VACUUM_PAGES = 10000            # Pages reclaimed per history clear
+
+
+def _get_writer():
+    """Return the shared writer connection. Caller must hold _writer_lock."""
+    global _writer_db
+    if _writer_db is None:
+        db = sqlite3.connect(str(DB_FILE), timeout=5,
+                             check_same_thread=False, isolation_level=None,
+                             cached_statements=256)
+        db.row_factory = sqlite3.Row
+        db.executescript(DB_WRITER_PRAGMAS)
+        _writer_db = db
+    return _writer_db
+
+
+@contextmanager
+def db_writer():
+    """Run a block of writes as one transaction on the writer connection."""
+    with _writer_lock:
+        db = _get_writer()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+
 def get_db():
-    db = sqlite3.connect(str(DB_FILE), timeout=5)
-    db.row_factory = sqlite3.Row
-    db.execute("PRAGMA journal_mode=WAL")
-    db.execute("PRAGMA busy_timeout=3000")
+    """Return this thread's read-only connection, opening it on first use."""
+    db = getattr(_db_local, "db", None)
+    if db is None:
+        db = sqlite3.connect(f"{DB_FILE.resolve().as_uri()}?mode=ro", uri=True,
+                             timeout=5, check_same_thread=False,
+                             isolation_level=None)
+        db.row_factory = sqlite3.Row
+        db.executescript(DB_READER_PRAGMAS)
+        _db_local.db = db
     return db
 
 
 def init_db():
-    db = get_db()
+    with _writer_lock:
+        _init_schema(_get_writer())
+
+
+def _init_schema(db):
+
+    # page_size and auto_vacuum only take effect on a rebuild (done once),
+    # and page_size can't change in WAL mode
+    page_size = db.execute("PRAGMA page_size").fetchone()[0]
+    auto_vacuum = db.execute("PRAGMA auto_vacuum").fetchone()[0]
+    if page_size != DB_PAGE_SIZE or auto_vacuum != DB_AUTO_VACUUM_INCREMENTAL:
+        db.execute("PRAGMA journal_mode=DELETE")
+        db.execute(f"PRAGMA page_size={DB_PAGE_SIZE}")
+        db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        db.execute("VACUUM")
+        db.execute("PRAGMA journal_mode=WAL")
+
     db.executescript("""
         CREATE TABLE IF NOT EXISTS sensor_readings (
             id          INTEGER PRIMARY KEY AUTOINCREMENT,
             timestamp   TEXT    NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%S','now','localtime')),
+            ts_epoch    INTEGER NOT NULL DEFAULT (CAST(strftime('%s','now') AS INTEGER)),
             node_id     TEXT    NOT NULL,
             duty        INTEGER NOT NULL DEFAULT 0,
             voltage     REAL    NOT NULL DEFAULT 0.0,
@@ -67,8 +186,23 @@ def init_db():
             target_duty INTEGER NOT NULL DEFAULT 0
         );
         CREATE INDEX IF NOT EXISTS idx_readings_node    ON sensor_readings(node_id);
-        CREATE INDEX IF NOT EXISTS idx_readings_ts      ON sensor_readings(timestamp DESC);
-        CREATE INDEX IF NOT EXISTS idx_readings_node_ts ON sensor_readings(node_id, timestamp DESC);
+
+        -- Per-node one-minute rollup of sensor_readings, keyed by bucket
+        -- start. Sums (not averages) so buckets combine exactly.
+        CREATE TABLE IF NOT EXISTS sensor_readings_1m (
+            node_id       TEXT    NOT NULL,
+            ts_epoch      INTEGER NOT NULL,
+            readings      INTEGER NOT NULL,
+            sum_duty      REAL    NOT NULL,
+            sum_voltage   REAL    NOT NULL,
+            sum_current   REAL    NOT NULL,
+            sum_power     REAL    NOT NULL,
+            min_power     REAL    NOT NULL,
+            max_power     REAL    NOT NULL,
+            first_reading TEXT    NOT NULL,
+            last_reading  TEXT    NOT NULL,
+            PRIMARY KEY (node_id, ts_epoch)
+        ) WITHOUT ROWID;
 
         CREATE TABLE IF NOT EXISTS settings (
             key   TEXT PRIMARY KEY,
@@ -81,6 +215,25 @@ def init_db():
         );
     """)
 
+    # Pre-epoch databases: add ts_epoch and backfill it from the local-time
+    # ISO strings. All range filters and bucketing use this column.
+    cols = {r["name"] for r in db.execute("PRAGMA table_info(sensor_readings)")}
+    if "ts_epoch" not in cols:
+        db.execute("ALTER TABLE sensor_readings ADD COLUMN ts_epoch INTEGER")
+        db.execute("UPDATE sensor_readings "
+                   "SET ts_epoch = CAST(strftime('%s', timestamp, 'utc') AS INTEGER)")
+    db.executescript("""
+        DROP INDEX IF EXISTS idx_readings_ts;
+        DROP INDEX IF EXISTS idx_readings_node_ts;
+        DROP INDEX IF EXISTS idx_readings_node_ts_asc;
+        CREATE INDEX IF NOT EXISTS idx_readings_epoch      ON sensor_readings(ts_epoch);
+        CREATE INDEX IF NOT EXISTS idx_readings_node_epoch ON sensor_readings(node_id, ts_epoch);
+    """)
+
+    # Databases created before the rollup existed: build it once
+    if db.execute("SELECT 1 FROM sensor_readings_1m LIMIT 1").fetchone() is None:
+        db.execute(ROLLUP_SQL, (0,))
+
     # Seed default settings if not present
     defaults = [
         ("theme", "dark"),
@@ -89,16 +242,50 @@ def init_db():
     for k, v in defaults:
         db.execute(
             "INSERT OR IGNORE INTO settings (key, value) VALUES (?, ?)", (k, v))
-    db.commit()
-    db.close()
+
+    # Refresh planner stats so range queries pick the epoch indexes
+    db.execute("ANALYZE sensor_readings")
 
 
+# Readings are buffered and committed in batches so the WAL commit/fsync
+# cost is paid once per FLUSH_INTERVAL instead of once per 2 s snapshot.
+FLUSH_INTERVAL = 10.0   # Seconds between batched commits
+FLUSH_MAX_ROWS = 500    # Commit early once this many rows are pending
+UNCHANGED_KEEPALIVE = 30  # Still record identical node data this often (s)
+
+# Kept as one constant string so the writer's statement cache always hits
+INSERT_SQL = """
+    INSERT INTO sensor_readings
+        (timestamp, ts_epoch, node_id, duty, voltage, current_ma,
+         power_mw, responsive, commanded_duty, target_duty)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Recompute every one-minute bucket from the given epoch onward
+ROLLUP_SQL = """
+    INSERT OR REPLACE INTO sensor_readings_1m
+    SELECT node_id, ts_epoch / 60 * 60 AS bucket, COUNT(*),
+           SUM(duty), SUM(voltage), SUM(current_ma), SUM(power_mw),
+           MIN(power_mw), MAX(power_mw), MIN(timestamp), MAX(timestamp)
+    FROM sensor_readings WHERE ts_epoch >= ?
+    GROUP BY node_id, bucket
+"""
+
 _last_ingested_ts = None
+_last_content = (None, 0)   # (hash of nodes blob, ts_epoch when recorded)
 _ingest_lock = threading.Lock()
+_pending_rows = []
+_last_flush = time.monotonic()
+
+
+def _content_hash(blob: bytes) -> int:
+    if _HAS_XXHASH:
+        return xxhash.xxh3_64_intdigest(blob)
+    return hash(blob)
 
 
 def ingest_state(state: dict):
-    global _last_ingested_ts
+    global _last_ingested_ts, _last_content
     ts = state.get("timestamp")
     if not ts:
         return
@@ -111,28 +298,101 @@ def ingest_state(state: dict):
     if not nodes:
         return
 
-    db = get_db()
     try:
-        rows = []
-        for nid, data in nodes.items():
-            rows.append((
-                ts, str(nid),
-                data.get("duty", 0), data.get("voltage", 0.0),
-                data.get("current", 0.0), data.get("power", 0.0),
-                1 if data.get("responsive", True) else 0,
-                data.get("commanded_duty", 0), data.get("target_duty", 0),
-            ))
-        db.executemany("""
-            INSERT INTO sensor_readings
-                (timestamp, node_id, duty, voltage, current_ma, power_mw,
-                 responsive, commanded_duty, target_duty)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, rows)
-        db.commit()
+        ts_epoch = _iso_to_epoch(ts)
+    except ValueError:
+        ts_epoch = int(time.time())
+
+    # Skip snapshots whose node data is identical to the last one recorded
+    h = _content_hash(orjson.dumps(nodes, option=orjson.OPT_NON_STR_KEYS))
+    with _ingest_lock:
+        last_h, last_epoch = _last_content
+        if h == last_h and ts_epoch - last_epoch < UNCHANGED_KEEPALIVE:
+            return
+        _last_content = (h, ts_epoch)
+
+    rows = []
+    for nid, data in nodes.items():
+        rows.append((
+            ts, ts_epoch, str(nid),
+            data.get("duty", 0), data.get("voltage", 0.0),
+            data.get("current", 0.0), data.get("power", 0.0),
+            1 if data.get("responsive", True) else 0,
+            data.get("commanded_duty", 0), data.get("target_duty", 0),
+        ))
+    with _ingest_lock:
+        _pending_rows.extend(rows)
+        full = len(_pending_rows) >= FLUSH_MAX_ROWS
+    if full:
+        _flush_pending()
+
+
+def _flush_pending():
+    """Commit all buffered readings in a single transaction."""
+    global _pending_rows, _last_flush
+    with _ingest_lock:
+        rows, _pending_rows = _pending_rows, []
+        _last_flush = time.monotonic()
+    if not rows:
+        return
+
+    try:
+        with db_writer() as db:
+            db.executemany(INSERT_SQL, rows)
+            db.execute(ROLLUP_SQL, (min(r[1] for r in rows) // 60 * 60,))
     except Exception as e:
         print(f"[DB] ingest error: {e}")
-    finally:
-        db.close()
+
+
+atexit.register(_flush_pending)
+
+
+# --------------------------------------------------------------------------- #
+#  State file
+# --------------------------------------------------------------------------- #
+
+# (st_mtime_ns, parsed state) — swapped as one tuple so readers never see
+# a new mtime paired with stale data.
+_state_cache = (0, None)
+_state_buf = bytearray(64 * 1024)    # reused read buffer, grown as needed
+_state_buf_lock = threading.Lock()
+
+
+def _read_state_file():
+    """Read mesh_state.json into the shared buffer and parse it.
+
+    Returns (mtime_ns, data); the mtime comes from the open descriptor so it
+    always matches the bytes parsed.
+    """
+    global _state_buf
+    with open(STATE_FILE, 'rb', buffering=0) as f:
+        st = os.fstat(f.fileno())
+        with _state_buf_lock:
+            if st.st_size > len(_state_buf):
+                _state_buf = bytearray(st.st_size)
+            with memoryview(_state_buf) as view:
+                n = 0
+                while n < st.st_size:
+                    got = f.readinto(view[n:st.st_size])
+                    if not got:
+                        break
+                    n += got
+                data = orjson.loads(view[:n])
+    return st.st_mtime_ns, data
+
+
+def _load_state():
+    """Return parsed mesh_state.json, re-reading only when its mtime changes.
+
+    Raises FileNotFoundError / orjson.JSONDecodeError like a plain read would.
+    """
+    global _state_cache
+    mtime = os.stat(STATE_FILE).st_mtime_ns
+    cached_mtime, data = _state_cache
+    if mtime != cached_mtime or data is None:
+        _state_cache = _read_state_file()
+        data = _state_cache[1]
+    return data
 
 
 # --------------------------------------------------------------------------- #
@@ -145,9 +405,9 @@ def _bg_ingest_loop():
             if app.config.get("MOCK_MODE"):
                 ingest_state(_build_mock_state())
             elif STATE_FILE.exists():
-                with open(STATE_FILE, "r") as f:
-                    state = json.load(f)
-                ingest_state(state)
+                ingest_state(_load_state())
+            if time.monotonic() - _last_flush >= FLUSH_INTERVAL:
+                _flush_pending()
         except Exception:
             pass
         time.sleep(2)
@@ -157,56 +417,95 @@ def _bg_ingest_loop():
 #  Mock data
 # --------------------------------------------------------------------------- #
 
-MOCK_STATE_TEMPLATE = {
-    "timestamp": "",
-    "gateway": {
-        "connected": True,
-        "device_name": "ESP-BLE-MESH",
-        "device_address": "98:A3:16:B1:C9:8A"
-    },
-    "power_manager": {
-        "active": True,
-        "threshold_mw": 5000,
-        "budget_mw": 4500,
-        "priority_node": "2",
-        "total_power_mw": 4243
-    },
-    "nodes": {
-        "1": {
-            "role": "sensing", "duty": 100, "voltage": 12.294,
-            "current": 1.25, "power": 15.4, "responsive": True,
-            "last_seen": 0, "commanded_duty": 100, "target_duty": 100
+def _build_mock_state():
+    """Build a fresh mock snapshot from literals (no template copy)."""
+    now = time.time()
+    v1 = round(12.2 + 0.1 * math.sin(now / 5), 3)
+    i1 = round(1.2 + 0.1 * random.random(), 2)
+    p1 = round(v1 * i1, 1)
+    v2 = round(11.7 + 0.05 * math.sin(now / 7), 3)
+    i2 = round(500 + 10 * random.random(), 1)
+    p2 = round(v2 * i2, 1)
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "gateway": {
+            "connected": True,
+            "device_name": "ESP-BLE-MESH",
+            "device_address": "98:A3:16:B1:C9:8A"
         },
-        "2": {
-            "role": "sensing", "duty": 0, "voltage": 11.735,
-            "current": 502.5, "power": 5896.8, "responsive": True,
-            "last_seen": 0, "commanded_duty": 0, "target_duty": 0
-        }
-    },
-    "relay_nodes": 1,
-    "sensing_node_count": 3,
-    "topology": {"node_roles": {"1": "direct", "2": "direct"}}
-}
+        "power_manager": {
+            "active": True,
+            "threshold_mw": 5000,
+            "budget_mw": 4500,
+            "priority_node": "2",
+            "total_power_mw": round(p1 + p2, 0)
+        },
+        "nodes": {
+            "1": {
+                "role": "sensing", "duty": 100, "voltage": v1,
+                "current": i1, "power": p1, "responsive": True,
+                "last_seen": now, "commanded_duty": 100, "target_duty": 100
+            },
+            "2": {
+                "role": "sensing", "duty": 0, "voltage": v2,
+                "current": i2, "power": p2, "responsive": True,
+                "last_seen": now, "commanded_duty": 0, "target_duty": 0
+            }
+        },
+        "relay_nodes": 1,
+        "sensing_node_count": 3,
+        "topology": {"node_roles": {"1": "direct", "2": "direct"}}
+    }
 
 
-def _build_mock_state():
-    import copy, math, random
-    state = copy.deepcopy(MOCK_STATE_TEMPLATE)
-    now = time.time()
-    state["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%S")
-    for node in state["nodes"].values():
-        node["last_seen"] = now
-    state["nodes"]["1"]["voltage"] = round(12.2 + 0.1 * math.sin(now / 5), 3)
-    state["nodes"]["1"]["current"] = round(1.2 + 0.1 * random.random(), 2)
-    state["nodes"]["1"]["power"] = round(
-        state["nodes"]["1"]["voltage"] * state["nodes"]["1"]["current"], 1)
-    state["nodes"]["2"]["voltage"] = round(11.7 + 0.05 * math.sin(now / 7), 3)
-    state["nodes"]["2"]["current"] = round(500 + 10 * random.random(), 1)
-    state["nodes"]["2"]["power"] = round(
-        state["nodes"]["2"]["voltage"] * state["nodes"]["2"]["current"], 1)
-    state["power_manager"]["total_power_mw"] = round(
-        state["nodes"]["1"]["power"] + state["nodes"]["2"]["power"], 0)
-    return state
+def _iso_to_epoch(ts: str) -> int:
+    """Convert a local-time ISO timestamp (as the gateway writes) to epoch seconds."""
+    return int(datetime.fromisoformat(ts).timestamp())
+
+
+# --------------------------------------------------------------------------- #
+#  Conditional responses (ETag / 304)
+# --------------------------------------------------------------------------- #
+
+def _etag(*parts) -> str:
+    key = "|".join(str(p) for p in parts)
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+
+def _not_modified(etag: str):
+    """Return a bare 304 if the client already holds this ETag, else None."""
+    if etag in request.if_none_match:
+        resp = Response(status=304)
+        resp.set_etag(etag)
+        return resp
+    return None
+
+
+def _with_etag(resp, etag: str):
+    resp.set_etag(etag)
+    return resp
+
+
+POINT_KEYS = ("timestamp", "duty", "voltage", "current_ma", "power_mw")
+
+
+def _stream_points(head: dict, cur):
+    """Stream {**head, "points": [...]} straight off the cursor.
+
+    Points are encoded one at a time, so large chart windows never hold the
+    full row list or JSON body in memory.
+    """
+    def gen():
+        try:
+            yield orjson.dumps(head)[:-1] + b',"points":['
+            sep = b""
+            for row in cur:
+                yield sep + orjson.dumps(dict(zip(POINT_KEYS, row)))
+                sep = b","
+            yield b"]}\n"
+        finally:
+            cur.close()     # ends the read snapshot even if the client left
+    return Response(stream_with_context(gen()), mimetype="application/json")
 
 
 # --------------------------------------------------------------------------- #
@@ -220,25 +519,28 @@ def index():
 
 @app.route('/api/state')
 def get_state():
-    if app.config.get('MOCK_MODE'):
-        state = _build_mock_state()
-        ingest_state(state)
-        return jsonify(state)
     try:
-        if STATE_FILE.exists():
-            with open(STATE_FILE, 'r') as f:
-                state = json.load(f)
-            ingest_state(state)
-            return jsonify(state)
+        if app.config.get('MOCK_MODE'):
+            state = _build_mock_state()
         else:
-            return jsonify({"error": "mesh_state.json not found",
-                            "hint": "Is gateway.py running?"}), 404
-    except json.JSONDecodeError:
+            state = _load_state()
+        ingest_state(state)
+        etag = _etag(state.get("timestamp", ""))
+        return _not_modified(etag) or _with_etag(jsonify(state), etag)
+    except FileNotFoundError:
+        return jsonify({"error": "mesh_state.json not found",
+                        "hint": "Is gateway.py running?"}), 404
+    except orjson.JSONDecodeError:
         return jsonify({"error": "mesh_state.json is malformed"}), 500
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+HISTORY_COLUMNS = ("id", "timestamp", "node_id", "duty", "voltage", "current_ma",
+                   "power_mw", "responsive", "commanded_duty", "target_duty")
+HISTORY_SELECT = ", ".join(HISTORY_COLUMNS)
+
+
 @app.route('/api/history')
 def get_history():
     node_id = request.args.get("node_id")
@@ -247,106 +549,182 @@ def get_history():
     since = request.args.get("since")
     until = request.args.get("until")
 
-    clauses, params = [], []
-    if node_id:
-        clauses.append("node_id = ?"); params.append(node_id)
-    if since:
-        clauses.append("timestamp >= ?"); params.append(since)
-    if until:
-        clauses.append("timestamp <= ?"); params.append(until)
-
-    where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
     db = get_db()
     try:
-        total = db.execute(
-            f"SELECT COUNT(*) as cnt FROM sensor_readings{where}", params
-        ).fetchone()["cnt"]
-
-        rows = db.execute(
-            f"SELECT * FROM sensor_readings{where} ORDER BY timestamp DESC LIMIT ? OFFSET ?",
+        clauses, params = [], []
+        if node_id:
+            clauses.append("node_id = ?"); params.append(node_id)
+        if since:
+            clauses.append("ts_epoch >= ?"); params.append(_iso_to_epoch(since))
+        if until:
+            clauses.append("ts_epoch <= ?"); params.append(_iso_to_epoch(until))
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+
+        # COUNT(*) OVER () rides along as the last column, so one query
+        # yields both the page and the filtered total.
+        cur = db.cursor()
+        cur.row_factory = None      # plain tuples; serialized as-is
+        rows = cur.execute(
+            f"SELECT {HISTORY_SELECT}, COUNT(*) OVER () AS _total "
+            f"FROM sensor_readings{where} "
+            "ORDER BY ts_epoch DESC, id DESC LIMIT ? OFFSET ?",
             params + [limit, offset]
         ).fetchall()
 
-        readings = [{
-            "id": r["id"], "timestamp": r["timestamp"], "node_id": r["node_id"],
-            "duty": r["duty"], "voltage": r["voltage"],
-            "current_ma": r["current_ma"], "power_mw": r["power_mw"],
-            "responsive": bool(r["responsive"]),
-            "commanded_duty": r["commanded_duty"], "target_duty": r["target_duty"],
-        } for r in rows]
+        if rows:
+            total = rows[0][-1]
+            rows = [r[:-1] for r in rows]
+        elif offset:
+            # Paged past the end: no row to carry the total
+            total = cur.execute(
+                f"SELECT COUNT(*) FROM sensor_readings{where}", params
+            ).fetchone()[0]
+        else:
+            total = 0
 
-        return jsonify({"readings": readings, "total": total, "limit": limit, "offset": offset})
+        return jsonify({"columns": HISTORY_COLUMNS, "rows": rows,
+                        "total": total, "limit": limit, "offset": offset})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        db.close()
 
 
 @app.route('/api/history/node/<node_id>')
 def get_node_history(node_id):
     """Return time-series data for a single node (for charts).
 
+    Points are averaged into time buckets so at most `limit` come back;
+    pass raw=1 to get the individual readings instead.
+
     Query params:
         minutes – lookback window (default 30, 0 = all history)
-        limit   – max points (default 500, 0 minutes bumps to 5000)
+        limit   – max points (default 500; raw with 0 minutes bumps to 5000)
+        raw     – 1 to skip downsampling
     """
     minutes = int(request.args.get("minutes", 30))
-    default_limit = 5000 if minutes == 0 else 500
-    limit = min(int(request.args.get("limit", default_limit)), 10000)
+    raw = request.args.get("raw") == "1"
+    default_limit = 5000 if raw and minutes == 0 else 500
+    limit = max(1, min(int(request.args.get("limit", default_limit)), 10000))
 
     db = get_db()
     try:
+        # Cheap index lookup: the newest row id changes whenever the
+        # node's history does, so it doubles as the response version.
+        last_id = db.execute(
+            "SELECT MAX(id) FROM sensor_readings WHERE node_id = ?",
+            [node_id]).fetchone()[0]
+        etag = _etag(node_id, last_id, minutes, limit, raw)
+        cached = _not_modified(etag)
+        if cached:
+            return cached
+
         if minutes > 0:
             cutoff = (datetime.now() - timedelta(minutes=minutes)).strftime("%Y-%m-%dT%H:%M:%S")
-            rows = db.execute("""
-                SELECT timestamp, duty, voltage, current_ma, power_mw
-                FROM sensor_readings
-                WHERE node_id = ? AND timestamp >= ?
-                ORDER BY timestamp ASC
-                LIMIT ?
-            """, [node_id, cutoff, limit]).fetchall()
+            cutoff_epoch = int(time.time()) - minutes * 60
+            window_s = minutes * 60
         else:
-            cutoff = None
-            rows = db.execute("""
-                SELECT timestamp, duty, voltage, current_ma, power_mw
-                FROM sensor_readings
-                WHERE node_id = ?
-                ORDER BY timestamp ASC
-                LIMIT ?
-            """, [node_id, limit]).fetchall()
-
-        points = [dict(r) for r in rows]
-        return jsonify({"node_id": node_id, "points": points, "since": cutoff})
+            cutoff, cutoff_epoch = None, 0
+            window_s = db.execute(
+                "SELECT MAX(ts_epoch) - MIN(ts_epoch) FROM sensor_readings WHERE node_id = ?",
+                [node_id]).fetchone()[0] or 0
+
+        cur = db.cursor()
+        cur.row_factory = None      # tuples, zipped with POINT_KEYS below
+        # Both queries keep the newest `limit` rows (the inner DESC LIMIT)
+        # and return them oldest first, so a cap never hides recent data.
+        if raw:
+            bucket = None
+            cur.execute("""
+                SELECT timestamp, duty, voltage, current_ma, power_mw FROM (
+                    SELECT ts_epoch, timestamp, duty, voltage, current_ma, power_mw
+                    FROM sensor_readings
+                    WHERE node_id = ? AND ts_epoch >= ?
+                    ORDER BY ts_epoch DESC
+                    LIMIT ?
+                ) ORDER BY ts_epoch ASC
+            """, [node_id, cutoff_epoch, limit])
+        else:
+            # Round up so the window fits in `limit` buckets; the one extra
+            # partial bucket epoch alignment can add is the oldest, and dropped.
+            bucket = max(1, -(-window_s // limit))
+            cur.execute("""
+                SELECT timestamp, duty, voltage, current_ma, power_mw FROM (
+                    SELECT MIN(ts_epoch)                AS t0,
+                           MIN(timestamp)               AS timestamp,
+                           ROUND(AVG(duty), 1)          AS duty,
+                           ROUND(AVG(voltage), 3)       AS voltage,
+                           ROUND(AVG(current_ma), 1)    AS current_ma,
+                           ROUND(AVG(power_mw), 1)      AS power_mw
+                    FROM sensor_readings
+                    WHERE node_id = ? AND ts_epoch >= ?
+                    GROUP BY ts_epoch / ?
+                    ORDER BY t0 DESC
+                    LIMIT ?
+                ) ORDER BY t0 ASC
+            """, [node_id, cutoff_epoch, bucket, limit])
+
+        head = {"node_id": node_id, "since": cutoff, "bucket_seconds": bucket}
+        return _with_etag(_stream_points(head, cur), etag)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        db.close()
+
+
+SUMMARY_ROLLUP_MINUTES = 5     # Windows this long read sensor_readings_1m
+
+SUMMARY_ROLLUP_SQL = """
+    SELECT node_id, SUM(n) as readings,
+        ROUND(SUM(sd) / SUM(n), 1) as avg_duty,
+        ROUND(SUM(sv) / SUM(n), 3) as avg_voltage,
+        ROUND(SUM(sc) / SUM(n), 1) as avg_current,
+        ROUND(SUM(sp) / SUM(n), 1) as avg_power,
+        ROUND(MIN(mn), 1) as min_power,
+        ROUND(MAX(mx), 1) as max_power,
+        MIN(f) as first_reading,
+        MAX(l) as last_reading
+    FROM (
+        SELECT node_id, readings AS n, sum_duty AS sd, sum_voltage AS sv,
+               sum_current AS sc, sum_power AS sp, min_power AS mn,
+               max_power AS mx, first_reading AS f, last_reading AS l
+        FROM sensor_readings_1m WHERE ts_epoch >= ?
+        UNION ALL
+        SELECT node_id, COUNT(*), SUM(duty), SUM(voltage), SUM(current_ma),
+               SUM(power_mw), MIN(power_mw), MAX(power_mw),
+               MIN(timestamp), MAX(timestamp)
+        FROM sensor_readings WHERE ts_epoch >= ? AND ts_epoch < ?
+        GROUP BY node_id
+    )
+    GROUP BY node_id ORDER BY node_id
+"""
 
 
 @app.route('/api/history/summary')
 def get_history_summary():
     minutes = int(request.args.get("minutes", 60))
     cutoff = (datetime.now() - timedelta(minutes=minutes)).strftime("%Y-%m-%dT%H:%M:%S")
+    since = int(time.time()) - minutes * 60
     db = get_db()
     try:
-        rows = db.execute("""
-            SELECT node_id, COUNT(*) as readings,
-                ROUND(AVG(duty), 1) as avg_duty,
-                ROUND(AVG(voltage), 3) as avg_voltage,
-                ROUND(AVG(current_ma), 1) as avg_current,
-                ROUND(AVG(power_mw), 1) as avg_power,
-                ROUND(MIN(power_mw), 1) as min_power,
-                ROUND(MAX(power_mw), 1) as max_power,
-                MIN(timestamp) as first_reading,
-                MAX(timestamp) as last_reading
-            FROM sensor_readings WHERE timestamp >= ?
-            GROUP BY node_id ORDER BY node_id
-        """, [cutoff]).fetchall()
+        if minutes >= SUMMARY_ROLLUP_MINUTES:
+            # Whole minutes come from the rollup; only the partial minute
+            # at the start of the window is read from raw readings.
+            edge = -(-since // 60) * 60
+            rows = db.execute(SUMMARY_ROLLUP_SQL, [edge, since, edge]).fetchall()
+        else:
+            rows = db.execute("""
+                SELECT node_id, COUNT(*) as readings,
+                    ROUND(AVG(duty), 1) as avg_duty,
+                    ROUND(AVG(voltage), 3) as avg_voltage,
+                    ROUND(AVG(current_ma), 1) as avg_current,
+                    ROUND(AVG(power_mw), 1) as avg_power,
+                    ROUND(MIN(power_mw), 1) as min_power,
+                    ROUND(MAX(power_mw), 1) as max_power,
+                    MIN(timestamp) as first_reading,
+                    MAX(timestamp) as last_reading
+                FROM sensor_readings WHERE ts_epoch >= ?
+                GROUP BY node_id ORDER BY node_id
+            """, [since]).fetchall()
         return jsonify({"summary": [dict(r) for r in rows], "since": cutoff, "minutes": minutes})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        db.close()
 
 
 @app.route('/api/db/stats')
@@ -362,8 +740,6 @@ def get_db_stats():
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        db.close()
 
 
 # --------------------------------------------------------------------------- #
@@ -385,15 +761,13 @@ def post_command():
     ts = datetime.now().strftime("%H:%M:%S")
     log_entry = {"time": ts, "type": "cmd", "text": cmd_text}
 
-    with _console_lock:
-        _console_log.append(log_entry)
+    _console_append(log_entry)
 
     if app.config.get("MOCK_MODE"):
         # Simulate responses
         resp_text = _mock_command_response(cmd_text)
         resp_entry = {"time": ts, "type": "resp", "text": resp_text}
-        with _console_lock:
-            _console_log.append(resp_entry)
+        _console_append(resp_entry)
         return jsonify({"status": "ok", "response": resp_text})
 
     # Write command to file for gateway.py to pick up
@@ -404,31 +778,63 @@ def post_command():
             "status": "pending"
         }
         tmp = str(COMMAND_FILE) + ".tmp"
-        with open(tmp, 'w') as f:
-            json.dump(cmd_data, f)
+        with open(tmp, 'wb') as f:
+            f.write(orjson.dumps(cmd_data))
         os.replace(tmp, str(COMMAND_FILE))
 
         resp_entry = {"time": ts, "type": "info", "text": f"Sent: {cmd_text}"}
-        with _console_lock:
-            _console_log.append(resp_entry)
+        _console_append(resp_entry)
         return jsonify({"status": "ok", "response": f"Command queued: {cmd_text}"})
     except Exception as e:
         err_entry = {"time": ts, "type": "error", "text": str(e)}
-        with _console_lock:
-            _console_log.append(err_entry)
+        _console_append(err_entry)
         return jsonify({"error": str(e)}), 500
 
 
 @app.route('/api/command/log')
 def get_command_log():
-    """Return recent console log entries."""
-    since_idx = int(request.args.get("since", 0))
-    with _console_lock:
-        entries = list(_console_log)
-    # Return entries after the given index
-    if since_idx > 0 and since_idx < len(entries):
-        entries = entries[since_idx:]
-    return jsonify({"entries": entries, "total": len(list(_console_log))})
+    """Return console log entries from absolute index ``since`` onward.
+
+    ``total`` is the index to pass as ``since`` on the next poll.
+    """
+    since_idx = request.args.get("since", 0, type=int)
+    head = _console_head
+    if since_idx > head:        # client predates a restart
+        since_idx = 0
+    entries = []
+    for seq in range(max(since_idx, head - CONSOLE_LOG_SIZE), head):
+        slot = _console_ring[seq % CONSOLE_LOG_SIZE]
+        if slot is None or slot[0] != seq:
+            head = seq          # lapped by newer appends; resume here next poll
+            break
+        entries.append(slot[1])
+    return jsonify({"entries": entries, "total": head})
+
+
+def _arg(parts, default):
+    return parts[1] if len(parts) > 1 else default
+
+
+_MOCK_HELP = ("Commands: node <id>, duty <0-100>, ramp, stop, read, status, "
+              "monitor, threshold <mW>, priority <id>, power")
+
+# First token -> responder(parts). Tokens that merely start with one of
+# _MOCK_PREFIXES (e.g. "DUTY:50") fall back to a prefix scan.
+_MOCK_COMMANDS = {
+    "HELP": lambda p: _MOCK_HELP,
+    "?": lambda p: _MOCK_HELP,
+    "READ": lambda p: "NODE1:DATA:D:75%,V:12.30V,I:250.5mA,P:3081.2mW",
+    "STATUS": lambda p: "NODE1: RUNNING duty=75% | NODE2: RUNNING duty=50%",
+    "STOP": lambda p: "SENT:ALL:STOP",
+    "RAMP": lambda p: "SENT:0:RAMP",
+    "POWER": lambda p: ("Threshold: 5000 mW | Budget: 4500 mW | "
+                        "Total: 4243 mW | Headroom: 757 mW"),
+    "DUTY": lambda p: f"SENT:0:DUTY:{_arg(p, '?')}",
+    "NODE": lambda p: f"Target node: {_arg(p, '0')}",
+    "THRESHOLD": lambda p: f"Threshold set: {_arg(p, '?')} mW",
+    "PRIORITY": lambda p: f"Priority node: {_arg(p, '?')}",
+}
+_MOCK_PREFIXES = ("DUTY", "NODE", "THRESHOLD", "PRIORITY")
 
 
 def _mock_command_response(cmd: str) -> str:
@@ -437,33 +843,12 @@ def _mock_command_response(cmd: str) -> str:
     if not parts:
         return "ERROR: empty command"
     c = parts[0]
-    if c in ('HELP', '?'):
-        return ("Commands: node <id>, duty <0-100>, ramp, stop, read, status, "
-                "monitor, threshold <mW>, priority <id>, power")
-    if c == 'READ':
-        return "NODE1:DATA:D:75%,V:12.30V,I:250.5mA,P:3081.2mW"
-    if c == 'STATUS':
-        return "NODE1: RUNNING duty=75% | NODE2: RUNNING duty=50%"
-    if c == 'STOP':
-        return "SENT:ALL:STOP"
-    if c == 'RAMP':
-        return "SENT:0:RAMP"
-    if c == 'POWER':
-        return ("Threshold: 5000 mW | Budget: 4500 mW | "
-                "Total: 4243 mW | Headroom: 757 mW")
-    if c.startswith('DUTY'):
-        val = parts[1] if len(parts) > 1 else '?'
-        return f"SENT:0:DUTY:{val}"
-    if c.startswith('NODE'):
-        nid = parts[1] if len(parts) > 1 else '0'
-        return f"Target node: {nid}"
-    if c.startswith('THRESHOLD'):
-        val = parts[1] if len(parts) > 1 else '?'
-        return f"Threshold set: {val} mW"
-    if c.startswith('PRIORITY'):
-        val = parts[1] if len(parts) > 1 else '?'
-        return f"Priority node: {val}"
-    return f"OK: {cmd}"
+    handler = _MOCK_COMMANDS.get(c)
+    if handler is None and c.startswith(_MOCK_PREFIXES):
+        handler = _MOCK_COMMANDS[next(p for p in _MOCK_PREFIXES if c.startswith(p))]
+    if handler is None:
+        return f"OK: {cmd}"
+    return handler(parts)
 
 
 @app.route('/static/<path:filename>')
@@ -485,8 +870,6 @@ def get_settings():
         return jsonify(settings)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        db.close()
 
 
 @app.route('/api/settings', methods=['PUT'])
@@ -496,21 +879,18 @@ def put_settings():
     if not body or not isinstance(body, dict):
         return jsonify({"error": "Expected JSON object"}), 400
 
-    db = get_db()
     try:
-        for k, v in body.items():
-            db.execute(
-                "INSERT INTO settings (key, value) VALUES (?, ?) "
-                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
-                (str(k), str(v)))
-        db.commit()
-        # Return all settings
-        rows = db.execute("SELECT key, value FROM settings").fetchall()
+        with db_writer() as db:
+            for k, v in body.items():
+                db.execute(
+                    "INSERT INTO settings (key, value) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (str(k), str(v)))
+            # Return all settings
+            rows = db.execute("SELECT key, value FROM settings").fetchall()
         return jsonify({r["key"]: r["value"] for r in rows})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        db.close()
 
 
 # --------------------------------------------------------------------------- #
@@ -527,8 +907,6 @@ def get_node_aliases():
         return jsonify(aliases)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        db.close()
 
 
 @app.route('/api/nodes/<node_id>/rename', methods=['PUT'])
@@ -541,32 +919,26 @@ def rename_node(node_id):
     if len(alias) > 50:
         return jsonify({"error": "alias must be 50 chars or less"}), 400
 
-    db = get_db()
     try:
-        db.execute(
-            "INSERT INTO node_aliases (node_id, alias) VALUES (?, ?) "
-            "ON CONFLICT(node_id) DO UPDATE SET alias = excluded.alias",
-            (str(node_id), alias))
-        db.commit()
+        with db_writer() as db:
+            db.execute(
+                "INSERT INTO node_aliases (node_id, alias) VALUES (?, ?) "
+                "ON CONFLICT(node_id) DO UPDATE SET alias = excluded.alias",
+                (str(node_id), alias))
         return jsonify({"node_id": node_id, "alias": alias})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        db.close()
 
 
 @app.route('/api/nodes/<node_id>/alias', methods=['DELETE'])
 def delete_node_alias(node_id):
     """Remove alias for a node (revert to default name)."""
-    db = get_db()
     try:
-        db.execute("DELETE FROM node_aliases WHERE node_id = ?", (str(node_id),))
-        db.commit()
+        with db_writer() as db:
+            db.execute("DELETE FROM node_aliases WHERE node_id = ?", (str(node_id),))
         return jsonify({"status": "ok", "node_id": node_id})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        db.close()
 
 
 # --------------------------------------------------------------------------- #
@@ -576,14 +948,13 @@ def delete_node_alias(node_id):
 @app.route('/api/nodes/<node_id>', methods=['DELETE'])
 def delete_node(node_id):
     """Remove a node: deletes its history and alias."""
-    db = get_db()
+    _flush_pending()
     try:
-        hist = db.execute(
-            "SELECT COUNT(*) as cnt FROM sensor_readings WHERE node_id = ?",
-            (str(node_id),)).fetchone()["cnt"]
-        db.execute("DELETE FROM sensor_readings WHERE node_id = ?", (str(node_id),))
-        db.execute("DELETE FROM node_aliases WHERE node_id = ?", (str(node_id),))
-        db.commit()
+        with db_writer() as db:
+            hist = db.execute(
+                "DELETE FROM sensor_readings WHERE node_id = ?", (str(node_id),)).rowcount
+            db.execute("DELETE FROM sensor_readings_1m WHERE node_id = ?", (str(node_id),))
+            db.execute("DELETE FROM node_aliases WHERE node_id = ?", (str(node_id),))
         return jsonify({
             "status": "ok",
             "node_id": node_id,
@@ -591,8 +962,6 @@ def delete_node(node_id):
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        db.close()
 
 
 # --------------------------------------------------------------------------- #
@@ -603,48 +972,44 @@ def delete_node(node_id):
 def clear_history():
     """Delete ALL sensor readings. Optional: ?node_id=X for one node only."""
     node_id = request.args.get("node_id")
-    db = get_db()
+    _flush_pending()
     try:
-        if node_id:
-            cnt = db.execute(
-                "SELECT COUNT(*) as cnt FROM sensor_readings WHERE node_id = ?",
-                (node_id,)).fetchone()["cnt"]
-            db.execute("DELETE FROM sensor_readings WHERE node_id = ?", (node_id,))
-        else:
-            cnt = db.execute(
-                "SELECT COUNT(*) as cnt FROM sensor_readings").fetchone()["cnt"]
-            db.execute("DELETE FROM sensor_readings")
-        db.commit()
+        with db_writer() as db:
+            if node_id:
+                cnt = db.execute(
+                    "DELETE FROM sensor_readings WHERE node_id = ?", (node_id,)).rowcount
+                db.execute("DELETE FROM sensor_readings_1m WHERE node_id = ?", (node_id,))
+            else:
+                cnt = db.execute("DELETE FROM sensor_readings").rowcount
+                db.execute("DELETE FROM sensor_readings_1m")
         try:
-            db.execute("VACUUM")
+            # Reclaim freed pages in a bounded batch instead of a full
+            # VACUUM rewrite of the whole file. executescript() steps the
+            # pragma to completion; execute() only frees a single page.
+            with _writer_lock:
+                _get_writer().executescript(
+                    f"PRAGMA incremental_vacuum({VACUUM_PAGES});")
         except Exception:
-            pass  # VACUUM may fail in some contexts; non-critical
+            pass  # non-critical; leftover free pages are reused by inserts
         return jsonify({"status": "ok", "deleted": cnt})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        db.close()
 
 
 # --------------------------------------------------------------------------- #
 #  Main
 # --------------------------------------------------------------------------- #
 
-def main():
-    parser = argparse.ArgumentParser(description='BLE Mesh Dashboard')
-    parser.add_argument('--port', type=int, default=5555)
-    parser.add_argument('--host', default='0.0.0.0')
-    parser.add_argument('--mock', action='store_true')
-    args = parser.parse_args()
-
-    app.config['MOCK_MODE'] = args.mock
+def start_services(mock=False):
+    """Open the database and start the ingest thread for this process."""
+    app.config['MOCK_MODE'] = mock
     init_db()
     print(f"  Database: {DB_FILE}")
 
     t = threading.Thread(target=_bg_ingest_loop, daemon=True, name="db-ingest")
     t.start()
 
-    if args.mock:
+    if mock:
         print(f"\n  MOCK MODE - fake mesh data\n")
     else:
         print(f"\n  State: {STATE_FILE}")
@@ -652,7 +1017,30 @@ def main():
             print(f"  WARNING: mesh_state.json not found")
         print()
 
-    app.run(host=args.host, port=args.port, debug=False)
+
+def main():
+    parser = argparse.ArgumentParser(description='BLE Mesh Dashboard')
+    parser.add_argument('--port', type=int, default=5555)
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--mock', action='store_true')
+    parser.add_argument('--dev', action='store_true',
+                        help='Use the single-threaded Flask dev server')
+    args = parser.parse_args()
+
+    if not args.dev:
+        try:
+            from serve_prod import serve
+        except ImportError:
+            print("  gunicorn not installed; using the Flask dev server "
+                  "(pip install gunicorn)")
+        else:
+            serve(app, start_services, _flush_pending, args.host, args.port,
+                  mock=args.mock)
+            return
+
+    start_services(args.mock)
+    # One request thread, so get_db() keeps reusing a single read connection
+    app.run(host=args.host, port=args.port, debug=False, threaded=False)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Production server for the BLE Mesh Dashboard.
+
+Runs the Flask app under gunicorn with a single gthread worker so the
+ingest thread and SQLite writer stay in one process, while up to eight
+browser polls are served concurrently on per-thread reader connections.
+
+Usage:
+    python serve_prod.py                   # Default: port 5555
+    python serve_prod.py --port 8888       # Custom port
+    python serve_prod.py --mock            # Mock data for UI development
+"""
+
+import argparse
+import sys
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:
+    if __name__ != '__main__':
+        raise  # dashboard.py falls back to the Flask dev server
+    print("ERROR: gunicorn not installed. Run: pip install gunicorn")
+    print("       (or start the dev server with: python dashboard.py --dev)")
+    sys.exit(1)
+
+WORKERS = 1     # one process: owns the ingest thread and the writer
+THREADS = 8     # concurrent requests, each with its own reader connection
+
+
+class DashboardServer(BaseApplication):
+    """Embedded gunicorn application serving the dashboard Flask app.
+
+    The app and its start/flush hooks are passed in, so dashboard.py running
+    as __main__ is never imported a second time.
+    """
+
+    def __init__(self, options, app, start_services, flush, mock=False):
+        self.options = options
+        self.application = app
+        self.start_services = start_services
+        self.flush = flush
+        self.mock = mock
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+        # Start services inside the worker, not the arbiter, so the
+        # SQLite writer and ingest thread are never shared across fork().
+        self.cfg.set("post_worker_init",
+                     lambda worker: self.start_services(self.mock))
+        self.cfg.set("worker_exit",
+                     lambda server, worker: self.flush())
+
+    def load(self):
+        return self.application
+
+
+def serve(app, start_services, flush, host, port, mock=False):
+    """Run the dashboard app under gunicorn until interrupted."""
+    options = {
+        "bind": f"{host}:{port}",
+        "workers": WORKERS,
+        "threads": THREADS,
+        "worker_class": "gthread",
+        "accesslog": None,
+    }
+    DashboardServer(options, app, start_services, flush, mock=mock).run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='BLE Mesh Dashboard (gunicorn)')
+    parser.add_argument('--port', type=int, default=5555)
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--mock', action='store_true')
+    args = parser.parse_args()
+
+    import dashboard
+    serve(dashboard.app, dashboard.start_services, dashboard._flush_pending,
+          args.host, args.port, mock=args.mock)
+
+
+if __name__ == '__main__':
+    main()
@@ -670,39 +670,43 @@ async function fetchHistory() {
         if (!resp.ok) return;
         const data = await resp.json();
         historyTotal = data.total;
-        renderHistoryTable(data.readings);
+        renderHistoryTable(data.columns, data.rows);
         updatePagination();
         updateDbStats();
     } catch (e) { console.error("History fetch:", e); }
 }
 
-function renderHistoryTable(readings) {
+function renderHistoryTable(columns, rows) {
     const tbody = document.getElementById('history-body');
-    if (!readings || !readings.length) {
+    if (!rows || !rows.length) {
         tbody.innerHTML = '<tr><td colspan="9" class="placeholder">No readings recorded yet.</td></tr>';
         document.getElementById('history-info').textContent = '';
         return;
     }
 
-    tbody.innerHTML = readings.map(r => {
-        const badge = r.responsive
+    const c = {};
+    columns.forEach((name, i) => { c[name] = i; });
+
+    tbody.innerHTML = rows.map(r => {
+        const badge = r[c.responsive]
             ? '<span class="badge badge-ok">OK</span>'
             : '<span class="badge badge-offline">OFF</span>';
+        const nid = r[c.node_id];
         return `<tr>
-            <td>${fmtTs(r.timestamp)}</td>
-            <td><span class="node-badge">${nodeAliases[r.node_id] || 'N' + r.node_id}</span></td>
-            <td>${r.duty}%</td>
-            <td>${r.voltage.toFixed(3)}</td>
-            <td>${r.current_ma.toFixed(1)}</td>
-            <td>${r.power_mw.toFixed(1)}</td>
-            <td>${r.target_duty}%</td>
-            <td>${r.commanded_duty}%</td>
+            <td>${fmtTs(r[c.timestamp])}</td>
+            <td><span class="node-badge">${nodeAliases[nid] || 'N' + nid}</span></td>
+            <td>${r[c.duty]}%</td>
+            <td>${r[c.voltage].toFixed(3)}</td>
+            <td>${r[c.current_ma].toFixed(1)}</td>
+            <td>${r[c.power_mw].toFixed(1)}</td>
+            <td>${r[c.target_duty]}%</td>
+            <td>${r[c.commanded_duty]}%</td>
             <td>${badge}</td>
         </tr>`;
     }).join('');
 
     document.getElementById('history-info').textContent =
-        `${historyOffset + 1}-${historyOffset + readings.length} of ${historyTotal}`;
+        `${historyOffset + 1}-${historyOffset + rows.length} of ${historyTotal}`;
 }
 
 function fmtTs(ts) {
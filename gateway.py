@@ -22,12 +22,14 @@ import argparse
 import json
 import os
 import re
+import stat
+import struct
 import sys
 import threading
 import time
 import traceback
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime
 from typing import Optional
 
 try:
@@ -37,18 +39,17 @@ except ImportError:
     print("ERROR: bleak not installed. Run: pip install bleak")
     sys.exit(1)
 
-# Textual TUI imports — only needed for interactive mode
-_HAS_TEXTUAL = False
+# Optional: uvloop (libuv event loop, Linux/macOS) — stock asyncio is used without it
 try:
-    from textual.app import App, ComposeResult
-    from textual.containers import Horizontal, Vertical
-    from textual.message import Message
-    from textual.widgets import Header, Footer, Input, RichLog, DataTable, Static
-    from textual import work, on
-    _HAS_TEXTUAL = True
-except ImportError as e:
-    print(f"Note: textual not available ({e}). Install with: pip install textual")
-    print("      Falling back to plain CLI mode.\n")
+    import uvloop
+    _HAS_UVLOOP = True
+except ImportError:
+    _HAS_UVLOOP = False
+
+# Textual TUI — imported lazily by _import_textual() so CLI/one-shot runs skip it.
+# None until the first import attempt, then True/False.
+_HAS_TEXTUAL: Optional[bool] = None
+MeshGatewayApp = None  # Defined by _import_textual()
 
 # Custom UUIDs matching ESP32-C6 ble_service.h
 DC_MONITOR_SERVICE_UUID = "0000dc01-0000-1000-8000-00805f9b34fb"
@@ -60,9 +61,82 @@ COMMAND_CHAR_UUID = "0000dc03-0000-1000-8000-00805f9b34fb"
 # After provisioning: "ESP-BLE-MESH" (mesh GATT proxy advert)
 DEVICE_NAME_PREFIXES = ["Mesh-Gateway", "ESP-BLE-MESH"]
 
-# Sensor data parsing regex (case-insensitive for mA/mW/MA/MW)
-SENSOR_RE = re.compile(r'D:(\d+)%,V:([\d.]+)V,I:([\d.]+)mA,P:([\d.]+)mW', re.IGNORECASE)
-NODE_ID_RE = re.compile(r'NODE(\d+)', re.IGNORECASE)
+# Precomputed scan matchers: tuple for str.startswith, lowercase set for UUIDs
+_NAME_PREFIXES = tuple(DEVICE_NAME_PREFIXES)
+_TARGET_UUIDS = frozenset({DC_MONITOR_SERVICE_UUID.lower()})
+
+# Valid target node: a single digit 0-9 or ALL (callers uppercase first)
+_NODE_RE = re.compile(r'(?:ALL|[0-9])')
+
+# Binary sensor frame: 0xFE magic, then node id, flags (bit 0 = poll reply),
+# duty %, millivolts, tenths of mA, microwatts — 12 bytes, one notification.
+BIN_SENSOR_MAGIC = 0xFE
+BIN_SENSOR_FLAG_POLL = 0x01
+BIN_SENSOR = struct.Struct("<BBBHHI")
+
+
+def _parse_sensor_payload(node_tag: bytes, payload: bytes):
+    """Parse b'NODE1', b'D:50%,V:12.345V,I:1234.5mA,P:15234.5mW' from raw bytes.
+
+    int()/float() read ASCII bytes directly, so nothing is decoded. Units are
+    matched in any case. Returns (node_id, duty, voltage, current, power) or
+    None if unparseable.
+    """
+    # Tags are always NODE<digits> (any case)
+    node_id = node_tag[4:]
+    if not (node_id.isdigit() and node_tag[:4].upper() == b"NODE"):
+        return None
+    try:
+        d, v, i, p = payload.split(b",", 4)[:4]
+        if d[:2] != b"D:" or v[:2] != b"V:" or i[:2] != b"I:" or p[:2] != b"P:":
+            return None
+        return (sys.intern(node_id.decode()), int(d[2:].rstrip(b"%")),
+                float(v[2:].rstrip(b"Vv")), float(i[2:].rstrip(b"mMaA")),
+                float(p[2:].rstrip(b"mMwW")))
+    except ValueError:
+        return None
+
+
+def _sensor_log_text(node_id: str, payload) -> str:
+    """'NODE<id> >> <payload>' log line; payload may be str or ASCII bytes."""
+    if not isinstance(payload, str):
+        payload = payload.decode('ascii', errors='replace')
+    return f"NODE{node_id} >> {payload}"
+
+
+def _cmd_bytes(cmd) -> bytes:
+    """Command as written to the GATT characteristic (str or pre-encoded bytes)."""
+    return cmd if isinstance(cmd, bytes) else cmd.encode('utf-8')
+
+
+def _cmd_text(cmd) -> str:
+    """Command as shown in the log."""
+    return cmd if isinstance(cmd, str) else cmd.decode('utf-8', errors='replace')
+
+
+def _resolve_future(fut: 'asyncio.Future') -> None:
+    """Set a waiter's result unless it already finished (runs on its loop)."""
+    if not fut.done():
+        fut.set_result(None)
+
+
+_hms_last: tuple[int, str] = (-1, "")  # (epoch second, formatted), swapped as one tuple
+
+
+def _hms(ts: float) -> str:
+    """Format an epoch timestamp as HH:MM:SS (only when a line is shown).
+
+    Lines in the same second (a notification burst) reuse the last string.
+    """
+    global _hms_last
+    sec = int(ts)
+    last = _hms_last
+    if last[0] == sec:
+        return last[1]
+    lt = time.localtime(sec)
+    text = "%02d:%02d:%02d" % (lt.tm_hour, lt.tm_min, lt.tm_sec)  # No strftime format parse
+    _hms_last = (sec, text)
+    return text
 
 
 class BleThread:
@@ -83,13 +157,14 @@ class BleThread:
         ready = threading.Event()
 
         def _run():
-            self._loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self._loop)
-            self._loop.set_exception_handler(self._exception_handler)
+            # Local ref: stop(wait=False) may clear self._loop while we wind down
+            loop = self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            loop.set_exception_handler(self._exception_handler)
             ready.set()
-            self._loop.run_forever()
-            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
-            self._loop.close()
+            loop.run_forever()
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
 
         self._thread = threading.Thread(target=_run, daemon=True, name="ble-io")
         self._thread.start()
@@ -101,16 +176,44 @@ class BleThread:
             raise RuntimeError("BleThread not started")
         return asyncio.run_coroutine_threadsafe(coro, self._loop)
 
-    async def submit_async(self, coro):
-        """Submit a coroutine and await its result from another async context."""
-        future = self.submit(coro)
-        return await asyncio.wrap_future(future)
+    def run_coro(self, coro) -> 'asyncio.Future':
+        """Submit a coroutine; return an asyncio future for the caller's loop.
+
+        Plain function, not a coroutine: awaiting the result costs no extra
+        frame per BLE command.
+        """
+        if self._loop is None:
+            raise RuntimeError("BleThread not started")
+        return asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._loop))
+
+    def submit_many(self, coros) -> 'asyncio.Future':
+        """Run several coroutines in order on the BLE loop with one cross-thread hop.
+
+        Result is a list with each coroutine's return value or exception.
+        """
+        coros = list(coros)
+
+        async def _run_all():
+            results = []
+            for c in coros:
+                try:
+                    results.append(await c)
+                except Exception as e:
+                    results.append(e)
+            return results
 
-    def stop(self):
-        """Stop the event loop and join the thread."""
+        try:
+            return self.run_coro(_run_all())
+        except RuntimeError:
+            for c in coros:
+                c.close()
+            raise
+
+    def stop(self, wait: bool = True):
+        """Stop the event loop and, unless wait=False, join the thread."""
         if self._loop and self._loop.is_running():
             self._loop.call_soon_threadsafe(self._loop.stop)
-        if self._thread:
+        if self._thread and wait:
             self._thread.join(timeout=5.0)
         self._loop = None
         self._thread = None
@@ -125,7 +228,30 @@ class BleThread:
             print(f"[BLE THREAD ERROR] {msg}")
 
 
-@dataclass
+class SensorSample:
+    """One parsed sensor reading handed to the TUI (plain slotted carrier).
+
+    Not a textual Message: readings go through MeshGatewayApp.ingest_sensor's
+    latest-wins dict, never the message bus.
+    """
+    __slots__ = ("node_id", "duty", "voltage", "current", "power", "ts")
+
+    def __init__(self, node_id: str, duty: int, voltage: float,
+                 current: float, power: float, ts: float):
+        self.node_id = node_id
+        self.duty = duty
+        self.voltage = voltage
+        self.current = current
+        self.power = power
+        self.ts = ts
+
+
+# slots=True drops the per-instance __dict__ (smaller, faster attribute
+# stores on the notification path); it needs Python 3.10+.
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class NodeState:
     """Tracks the last known state of a single mesh node."""
     node_id: str
@@ -135,7 +261,8 @@ class NodeState:
     voltage: float = 0.0       # V
     current: float = 0.0       # mA
     power: float = 0.0         # mW
-    last_seen: float = field(default_factory=time.time)
+    last_seen: float = field(default_factory=time.monotonic)  # time.monotonic()
+    last_seen_wall: float = field(default_factory=time.time)  # Same moment, for export
     responsive: bool = True
     poll_gen: int = 0          # Which poll cycle this data is from
 
@@ -153,22 +280,35 @@ class PowerManager:
 
     POLL_INTERVAL = 3.0    # Seconds between poll cycles
     READ_STAGGER = 2.5     # Seconds between READ commands (must exceed mesh SEND_COMP time)
+    RELAY_GAP = 1.0        # Pause between poll replies and duty writes when pacing
+    PACE_WRITES = False    # Set True if the firmware needs fixed gaps between commands
     STALE_TIMEOUT = 10.0   # Seconds before marking node unresponsive (relay round trips are slow)
     COOLDOWN = 5.0         # Seconds between adjustments (give mesh time to settle)
     HEADROOM_MW = 500.0    # Target buffer below threshold (budget = threshold - headroom)
     PRIORITY_WEIGHT = 2.0  # Priority node gets this many "shares" vs 1 for normal nodes
+    PROBE_CONCURRENCY = 2  # Unicast READs in flight at once during discovery
 
     def __init__(self, gateway):
         self.gateway = gateway
-        self.nodes: dict[str, NodeState] = {}
+        # Keyed by int node id (cheap hashing, numeric ordering); the
+        # string form lives in NodeState.node_id for protocol I/O.
+        self.nodes: dict[int, NodeState] = {}
         self.threshold_mw: Optional[float] = None
         self.priority_node: Optional[str] = None
+        self._priority_key: Optional[int] = None  # priority_node as a nodes key
         self._adjusting = False
         self._last_adjustment: float = 0
         self._force_evaluate = False  # Set True to bypass cooldown on next eval
+        self._dirty = False  # New sensor/target data since the last evaluation
         self._poll_generation: int = 0
         self._polling = False  # True while a poll cycle is active
         self._needs_bootstrap = False
+        self._batch_supported: Optional[bool] = None  # Unknown until first BATCH
+        # Poll-response tracking: set when every expected node has reported.
+        # Created lazily on the BLE loop by the first poll.
+        self._expected_responders: set[int] = set()
+        self._responses_complete: Optional[asyncio.Event] = None
+        self._responses_loop: Optional[asyncio.AbstractEventLoop] = None
 
     # ---- Public API ----
 
@@ -205,6 +345,8 @@ class PowerManager:
         """Disable power management and restore original duty cycles."""
         self.threshold_mw = None
         self._polling = False
+        if self._responses_complete:
+            self._responses_complete.set()  # Release a poll waiting on replies
         # Wait for any in-flight mesh commands to complete before restoring
         await asyncio.sleep(2.0)
         # Restore all nodes to their target duty
@@ -222,6 +364,7 @@ class PowerManager:
     def set_priority(self, node_id: str):
         """Set the priority node. Triggers immediate rebalance."""
         self.priority_node = node_id
+        self._priority_key = int(node_id) if node_id.isdigit() else None
         self._force_evaluate = True  # Force rebalance on next cycle
         if self.threshold_mw:
             budget = self.threshold_mw - self.HEADROOM_MW
@@ -240,6 +383,7 @@ class PowerManager:
     def clear_priority(self):
         """Remove priority designation. Triggers immediate rebalance to equal shares."""
         self.priority_node = None
+        self._priority_key = None
         self._force_evaluate = True  # Force rebalance on next cycle
         if self.threshold_mw:
             budget = self.threshold_mw - self.HEADROOM_MW
@@ -252,12 +396,15 @@ class PowerManager:
 
     def set_target_duty(self, node_id: str, duty: int):
         """Record the user-requested duty for a node."""
-        if node_id not in self.nodes:
-            self.nodes[node_id] = NodeState(node_id=node_id)
-        self.nodes[node_id].target_duty = duty
+        key = int(node_id)
+        ns = self.nodes.get(key)
+        if ns is None:
+            ns = self.nodes[key] = NodeState(node_id=str(node_id))
+        ns.target_duty = duty
         # Also sync commanded_duty so PM's mw_per_pct estimate stays accurate
         # when user changes duty while PM is active
-        self.nodes[node_id].commanded_duty = duty
+        ns.commanded_duty = duty
+        self._dirty = True
         self.gateway._export_mesh_state()
 
     def status(self) -> str:
@@ -282,10 +429,10 @@ class PowerManager:
             share_info = {}
             if self.threshold_mw is not None and responsive_count > 0:
                 budget = self.threshold_mw - self.HEADROOM_MW
-                if self.priority_node and self.priority_node in self.nodes:
+                if self._priority_key in self.nodes:
                     total_shares = self.PRIORITY_WEIGHT + (responsive_count - 1)
                     for nid in self.nodes:
-                        if nid == self.priority_node:
+                        if nid == self._priority_key:
                             share_info[nid] = budget * (self.PRIORITY_WEIGHT / total_shares)
                         else:
                             share_info[nid] = budget * (1.0 / total_shares)
@@ -295,7 +442,7 @@ class PowerManager:
                         share_info[nid] = per_share
 
             lines.append("Nodes:")
-            for nid in sorted(self.nodes.keys()):
+            for nid in sorted(self.nodes):
                 ns = self.nodes[nid]
                 st = "ok" if ns.responsive else "stale"
                 target = f" (target:{ns.target_duty}%)" if ns.target_duty != ns.duty else ""
@@ -321,22 +468,30 @@ class PowerManager:
     def on_sensor_data(self, node_id: str, duty: int, voltage: float,
                        current: float, power: float):
         """Update node state from parsed sensor data."""
-        if node_id not in self.nodes:
-            self.nodes[node_id] = NodeState(node_id=node_id)
+        key = int(node_id)
+        ns = self.nodes.get(key)
+        if ns is None:
+            ns = self.nodes[key] = NodeState(node_id=node_id)
 
-        ns = self.nodes[node_id]
         ns.duty = duty
         ns.voltage = voltage
         ns.current = current
         ns.power = power
-        ns.current = current
-        ns.power = power
-        ns.last_seen = time.time()
+        ns.last_seen = time.monotonic()
+        ns.last_seen_wall = time.time()
         ns.responsive = True
         ns.poll_gen = self._poll_generation
+        self._dirty = True
+
+        # Last outstanding reply for this poll wakes _wait_for_responses
+        pending = self._expected_responders
+        if key in pending:
+            pending.discard(key)
+            if not pending:
+                self._responses_loop.call_soon_threadsafe(self._responses_complete.set)
 
         # Only sync commanded_duty when PM is OFF — when PM is active,
-        # only _nudge_node() updates commanded_duty (avoids stale sensor
+        # only _record_nudge() updates commanded_duty (avoids stale sensor
         # data overwriting what PM just sent, which causes oscillation)
         if self.threshold_mw is None:
             ns.commanded_duty = duty
@@ -366,28 +521,45 @@ class PowerManager:
             self.gateway.log(
                 f"[POWER] {len(self.gateway.known_nodes)} node(s) already discovered")
             # Seed PM from known_nodes
-            for nid in self.gateway.known_nodes:
-                if nid not in self.nodes:
-                    await self.gateway.send_to_node(nid, "READ", _silent=True)
-                    await self.gateway._wait_node_response(nid)
+            await self._probe_nodes(
+                [nid for nid in self.gateway.known_nodes if int(nid) not in self.nodes])
             return
 
         self.gateway.log(f"[POWER] Probing {count} sensing node(s)...")
+        to_probe = []
         for nid in range(1, count + 1):
-            if self.threshold_mw is None:
-                return
-            nid_str = str(nid)
-            if nid_str in self.nodes:
+            if nid in self.nodes:
                 self.gateway.log(f"[POWER] Node {nid} already known")
-                continue
-            await self.gateway.send_to_node(nid_str, "READ", _silent=True)
-            responded = await self.gateway._wait_node_response(nid_str)
+            else:
+                to_probe.append(str(nid))
+        results = await self._probe_nodes(to_probe)
+        if self.threshold_mw is None:
+            return
+        for nid_str, responded in results.items():
             if responded:
-                self.gateway.log(f"[POWER] Found node {nid}")
+                self.gateway.log(f"[POWER] Found node {nid_str}")
             else:
-                self.gateway.log(f"[POWER] Node {nid} no response")
+                self.gateway.log(f"[POWER] Node {nid_str} no response")
         self.gateway.log(f"[POWER] Discovery complete: {len(self.nodes)} node(s)")
 
+    async def _probe_nodes(self, node_ids: list) -> dict:
+        """READ several nodes concurrently and wait for each to answer.
+
+        At most PROBE_CONCURRENCY READs are in flight at once so the mesh
+        isn't flooded. Returns {node_id: responded}.
+        """
+        sem = asyncio.Semaphore(self.PROBE_CONCURRENCY)
+
+        async def probe(nid):
+            async with sem:
+                if self.threshold_mw is None:
+                    return False
+                await self.gateway.send_to_node(nid, "READ", _silent=True)
+                return await self.gateway._wait_node_response(nid)
+
+        results = await asyncio.gather(*(probe(nid) for nid in node_ids))
+        return dict(zip(node_ids, results))
+
     async def poll_loop(self):
         """Periodic poll-and-adjust cycle. Called by TUI @work or asyncio task."""
         if self._polling:
@@ -411,7 +583,8 @@ class PowerManager:
                 await self._poll_all_nodes()
                 await self._wait_for_responses(timeout=4.0)
                 self._mark_stale_nodes()
-                await asyncio.sleep(1.0)  # Relay breathing gap — let radio catch up
+                if self.PACE_WRITES:
+                    await asyncio.sleep(self.RELAY_GAP)  # Relay breathing gap
                 await self._evaluate_and_adjust()
                 await asyncio.sleep(self.POLL_INTERVAL)
             self._polling = False
@@ -425,37 +598,39 @@ class PowerManager:
         group send (0xC000).  All subscribed nodes respond individually.
         """
         self._poll_generation += 1
-        if not self.nodes:
+        self._expected_responders = {nid for nid, ns in self.nodes.items() if ns.responsive}
+        if not self._expected_responders:
             return
-        await self.gateway.send_to_node("ALL", "READ", _silent=True)
+        if self._responses_complete is None:
+            self._responses_loop = asyncio.get_running_loop()
+            self._responses_complete = asyncio.Event()
+        self._responses_complete.clear()
+        await self.gateway.send_to_node("ALL", "READ", _silent=True, _poll_tag=True)
         await self._wait_for_responses(timeout=3.0)
 
     async def _wait_for_responses(self, timeout: float = 3.0):
-        """Wait until all responsive nodes report for this poll cycle, or timeout."""
-        deadline = time.monotonic() + timeout
-        while time.monotonic() < deadline:
-            if self.threshold_mw is None:
-                return
-            all_fresh = all(
-                ns.poll_gen == self._poll_generation
-                for ns in self.nodes.values()
-                if ns.responsive
-            )
-            if all_fresh:
-                return
-            await asyncio.sleep(0.1)
+        """Wait until all responsive nodes report for this poll cycle, or timeout.
+
+        Woken by on_sensor_data when the last expected node reports, or by
+        disable(); no periodic polling.
+        """
+        if self.threshold_mw is None or not self._expected_responders:
+            return
+        try:
+            await asyncio.wait_for(self._responses_complete.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
 
     def _mark_stale_nodes(self):
         """Mark nodes that haven't responded recently as unresponsive."""
-        now = time.time()
+        now = time.monotonic()
         for ns in self.nodes.values():
-            if not ns.node_id.isdigit():
-                continue  # Skip phantom nodes like "ALL"
             age = now - ns.last_seen
             if age > self.STALE_TIMEOUT:
                 if ns.responsive:
                     self.gateway.log(
                         f"[POWER] Node {ns.node_id} unresponsive ({age:.0f}s)")
+                    self._dirty = True  # Responsive set changed
                 ns.responsive = False
         self.gateway._export_mesh_state()
 
@@ -477,9 +652,27 @@ class PowerManager:
             self.gateway.log(f"[PM] skip: cooldown {since:.1f}/{self.COOLDOWN}s",
                              _debug=True)
             return
+        if not forced and not self._dirty:
+            self.gateway.log("[PM] skip: no new data since last check", _debug=True)
+            return
         self._force_evaluate = False  # Clear flag before evaluating
-
-        responsive = {nid: ns for nid, ns in self.nodes.items() if ns.responsive}
+        self._dirty = False
+
+        # One pass over the nodes gathers everything the checks below need
+        responsive = {}
+        total_power = 0.0
+        all_at_ceiling = True   # every node already commanded at its target
+        all_in_sync = True      # commanded duty matches sensor duty (2% tolerance)
+        for nid, ns in self.nodes.items():
+            if not ns.responsive:
+                continue
+            responsive[nid] = ns
+            total_power += ns.power
+            if not (ns.target_duty > 0 and ns.commanded_duty >= ns.target_duty):
+                all_at_ceiling = False
+            if ns.commanded_duty > 0 and abs(ns.duty - ns.commanded_duty) > 2:
+                # a mismatch means the node didn't receive the last command
+                all_in_sync = False
         if not responsive:
             self.gateway.log("[PM] skip: no responsive nodes", _debug=True)
             return
@@ -490,8 +683,6 @@ class PowerManager:
                              _debug=True)
             return
 
-        total_power = sum(ns.power for ns in responsive.values())
-
         # Log per-node state for debugging
         for nid, ns in responsive.items():
             self.gateway.log(
@@ -511,18 +702,7 @@ class PowerManager:
                     f"diff={diff:.0f} < band={deadband:.0f})", _debug=True)
                 return
 
-            # Skip if all nodes are at their ceiling and under budget
-            all_at_ceiling = all(
-                (ns.target_duty > 0 and ns.commanded_duty >= ns.target_duty)
-                for ns in responsive.values()
-            )
-            # Also verify commanded duty matches actual sensor duty —
-            # a mismatch means the node didn't receive the last command
-            all_in_sync = all(
-                abs(ns.duty - ns.commanded_duty) <= 2  # 2% tolerance
-                for ns in responsive.values()
-                if ns.commanded_duty > 0
-            )
+            # Skip if all nodes are at their ceiling, in sync and under budget
             if all_at_ceiling and all_in_sync and total_power <= budget:
                 self.gateway.log(
                     f"[PM] skip: all at ceiling, in sync & under budget "
@@ -557,7 +737,7 @@ class PowerManager:
 
         self._adjusting = True
         try:
-            if self.priority_node and self.priority_node in responsive:
+            if self._priority_key in responsive:
                 await self._balance_with_priority(responsive, budget)
             else:
                 await self._balance_proportional(responsive, budget)
@@ -585,13 +765,11 @@ class PowerManager:
             return sum(estimates) / len(estimates)
         return 50.0  # Last resort default
 
-    async def _nudge_node(self, nid: str, ns: NodeState, target_share_mw: float,
-                          all_nodes: dict) -> str | None:
-        """Nudge a single node's duty toward its target power share.
+    def _plan_nudge(self, nid: int, ns: NodeState, target_share_mw: float,
+                    all_nodes: dict):
+        """Work out the duty that moves a node toward its target power share.
 
-        Returns a change description string, or None if no change needed.
-        Sends the duty command once — retries happen on the next poll cycle
-        instead of blocking here (which caused cascading delays).
+        Returns (current, new_duty), or None if no change is needed.
         """
         mw_per_pct = self._estimate_mw_per_pct(ns, all_nodes)
         ideal_duty = target_share_mw / mw_per_pct
@@ -609,16 +787,58 @@ class PowerManager:
             f"ceiling={ceiling}%, clamped={new_duty}%, current={current}%",
             _debug=True)
 
-        if new_duty == current:
-            return None
-
         new_duty = max(0, min(100, new_duty))
         if new_duty == current:
             return None
+        return current, new_duty
+
+    async def _apply_nudges(self, plans: list):
+        """Send planned duty changes, given as (nid, ns, current, new_duty).
 
-        change = f"N{nid}:{current}->{new_duty}%"
-        await self.gateway.set_duty(nid, new_duty, _from_power_mgr=True, _silent=True)
-        confirmed = await self.gateway._wait_node_response(nid)
+        Several changes go out as one BATCH:<nid>=<duty>,... write. If the
+        firmware never acknowledges a batch, fall back to one DUTY command
+        per node from then on. Each command is sent once — retries happen
+        on the next poll cycle instead of blocking here.
+        """
+        if len(plans) > 1 and self._batch_supported is not False:
+            confirmed = await self._send_batch(plans)
+            if any(confirmed):
+                self._batch_supported = True
+            elif self._batch_supported is None:
+                self._batch_supported = False
+                self.gateway.log("[PM] BATCH not acknowledged — using per-node DUTY")
+            if self._batch_supported:
+                for plan, ok in zip(plans, confirmed):
+                    self._record_nudge(*plan, ok)
+                return
+
+        for nid, ns, current, new_duty in plans:
+            await self.gateway.set_duty(ns.node_id, new_duty, _from_power_mgr=True, _silent=True)
+            ok = await self.gateway._wait_node_response(ns.node_id)
+            self._record_nudge(nid, ns, current, new_duty, ok)
+            if self.PACE_WRITES:
+                await asyncio.sleep(self.READ_STAGGER)
+
+    async def _send_batch(self, plans: list) -> list:
+        """Write all duty changes in one command; return per-node confirmations.
+
+        A node confirms only by reporting the duty sent to it: any reply
+        (e.g. a late answer to an earlier poll) would otherwise mark BATCH
+        supported on firmware that ignores it.
+        """
+        waits = [asyncio.ensure_future(self.gateway._wait_node_response(ns.node_id))
+                 for _, ns, _, _ in plans]
+        await asyncio.sleep(0)  # let the waiters register before replies arrive
+        cmd = "BATCH:" + ",".join(f"{nid}={duty}" for nid, _, _, duty in plans)
+        for _, ns, _, _ in plans:
+            self.gateway._forget_duty(ns.node_id)
+        await self.gateway.send_command(cmd, _silent=True)
+        replied = await asyncio.gather(*waits)
+        # on_sensor_data updates ns.duty before the node's event is set
+        return [ok and ns.duty == duty for ok, (_, ns, _, duty) in zip(replied, plans)]
+
+    def _record_nudge(self, nid: int, ns: NodeState, current: int, new_duty: int,
+                      confirmed: bool):
         if confirmed:
             ns.commanded_duty = new_duty
         else:
@@ -627,30 +847,37 @@ class PowerManager:
                 f"keeping cmd={current}%", _debug=True)
             # Don't update commanded_duty — node may not have received it.
             # Next poll cycle will re-evaluate with accurate data.
-        return change
 
     async def _balance_proportional(self, nodes: dict, budget: float):
         """Equal power shares: each node gets budget/N."""
         n = len(nodes)
         share_mw = budget / n
 
-        changes = []
-        for nid, ns in sorted(nodes.items(), key=lambda x: int(x[0]) if x[0].isdigit() else 999):
-            change = await self._nudge_node(nid, ns, share_mw, nodes)
-            if change:
-                changes.append(change)
+        plans = []
+        for nid, ns in sorted(nodes.items()):
+            plan = self._plan_nudge(nid, ns, share_mw, nodes)
+            if plan:
+                plans.append((nid, ns, *plan))
+        await self._apply_nudges(plans)
 
         total_power = sum(ns.power for ns in nodes.values())
-        if changes:
+        if plans:
+            changes = [f"N{nid}:{cur}->{new}%" for nid, _, cur, new in plans]
             self.gateway.log(
                 f"[POWER] Balancing {total_power:.0f}/{budget:.0f}mW "
                 f"(share:{share_mw:.0f}mW each) — {', '.join(changes)}")
 
     async def _balance_with_priority(self, nodes: dict, budget: float):
         """Weighted power shares: priority node gets PRIORITY_WEIGHT x normal share."""
-        priority_ns = nodes[self.priority_node]
-        non_priority = {nid: ns for nid, ns in nodes.items()
-                        if nid != self.priority_node}
+        pri = self._priority_key
+        priority_ns = nodes[pri]
+        # One pass: non-priority nodes in id order, plus the total draw
+        non_priority = []
+        total_power = 0.0
+        for nid, ns in sorted(nodes.items()):
+            total_power += ns.power
+            if nid != pri:
+                non_priority.append((nid, ns))
 
         # Calculate weighted shares
         total_shares = self.PRIORITY_WEIGHT + len(non_priority)
@@ -663,27 +890,26 @@ class PowerManager:
         if pri_max_power < priority_budget and non_priority:
             # Priority can't fill its share — surplus goes to non-priority
             priority_budget = pri_max_power
-            remaining = budget - priority_budget
-        else:
-            remaining = budget - priority_budget
+        remaining = budget - priority_budget
 
         non_pri_share = remaining / len(non_priority) if non_priority else 0
 
-        changes = []
-        # Nudge priority node
-        change = await self._nudge_node(self.priority_node, priority_ns,
-                                        priority_budget, nodes)
-        if change:
-            changes.append(change + "(pri)")
-
-        # Nudge non-priority nodes
-        for nid, ns in sorted(non_priority.items(), key=lambda x: int(x[0]) if x[0].isdigit() else 999):
-            change = await self._nudge_node(nid, ns, non_pri_share, nodes)
-            if change:
-                changes.append(change)
-
-        total_power = sum(ns.power for ns in nodes.values())
-        if changes:
+        plans = []
+        # Priority node first
+        plan = self._plan_nudge(pri, priority_ns, priority_budget, nodes)
+        if plan:
+            plans.append((pri, priority_ns, *plan))
+
+        # Then non-priority nodes
+        for nid, ns in non_priority:
+            plan = self._plan_nudge(nid, ns, non_pri_share, nodes)
+            if plan:
+                plans.append((nid, ns, *plan))
+        await self._apply_nudges(plans)
+
+        if plans:
+            changes = [f"N{nid}:{cur}->{new}%" + ("(pri)" if nid == pri else "")
+                       for nid, _, cur, new in plans]
             self.gateway.log(
                 f"[POWER] Balancing {total_power:.0f}/{budget:.0f}mW "
                 f"(pri:{priority_budget:.0f}mW, others:{non_pri_share:.0f}mW each) "
@@ -691,20 +917,54 @@ class PowerManager:
 
 
 class DCMonitorGateway:
-    def __init__(self):
+    # Fixed attribute set: slot access on the notification hot path, no __dict__
+    __slots__ = (
+        "client", "connected_device", "running", "target_node", "_chunk_buf",
+        "_power_manager", "_monitoring", "_app", "_log_impl", "ble_thread",
+        "_node_events", "known_nodes", "sensing_node_count", "_node_cache",
+        "_pending_duty", "_confirmed_duty", "_response_futures", "_op_loop", "_disconnected",
+        "coalesce", "_write_queue", "_write_wake", "_writer_task", "_cmd_char",
+        "_write_no_rsp", "_out_buf", "_out_loop", "_out_pending",
+        "_dashboard_polling", "_dashboard_poll_active", "_dashboard_poll_interval",
+    )
+
+    OUT_FLUSH_INTERVAL = 0.05  # Seconds; plain-CLI lines within one window share a single write
+    COALESCE_WINDOW = 0.01     # Seconds to gather commands behind the first one (--coalesce)
+    SEND_MANY_LIMIT = 8        # Writes in flight at once; the gateway's TX buffers are few
+
+    def __init__(self, coalesce: bool = False):
         self.client = None
         self.connected_device = None
         self.running = True
         self.target_node = "0"
-        self._chunk_buf = ""  # Buffer for reassembling chunked notifications
+        self._chunk_buf = bytearray()  # Raw bytes of '+' chunks awaiting the final one
         self._power_manager = None  # PowerManager instance
         self._monitoring = False  # True when monitor mode is active
-        self.app = None  # Reference to TUI app (set by MeshGatewayApp)
+        self.app = None  # Reference to TUI app (set by MeshGatewayApp); binds log()
         self.ble_thread = None  # BleThread instance (set by TUI app)
         self._node_events: dict[str, threading.Event] = {}  # Signaled when node responds
         self.known_nodes: set[str] = set()  # Node IDs that have actually responded with sensor data
         self.sensing_node_count = 0  # Set from BLE scan: total_mesh_devices - 1 (GATT gateway)
         self._node_cache: dict[str, dict] = {}  # Last sensor data per node (for dashboard when PM is None)
+        # User DUTY per node: written but not yet reported, then confirmed by a
+        # sensor report (only a confirmed duty lets set_duty skip a repeat)
+        self._pending_duty: dict[str, int] = {}
+        self._confirmed_duty: dict[str, int] = {}
+        # One-shot CLI: future per node, resolved by that node's first reply
+        self._response_futures: dict[str, asyncio.Future] = {}
+        self._op_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._disconnected: Optional[asyncio.Event] = None  # Set by bleak on link loss
+        # Write coalescing (opt-in): firmware must split command writes on '\n'
+        self.coalesce = coalesce
+        self._write_queue: Optional[list[bytes]] = None  # Encoded commands awaiting the writer
+        self._write_wake: Optional[asyncio.Event] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._cmd_char = COMMAND_CHAR_UUID  # Resolved characteristic once connected
+        self._write_no_rsp = True  # Characteristic supports write-without-response
+        # Plain CLI: notification output is buffered and printed from the loop
+        self._out_buf: deque = deque(maxlen=1024)  # Drops the oldest lines in a burst
+        self._out_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._out_pending = False
         self._dashboard_polling = False
         self._dashboard_poll_active = False  # True only during the actual send/wait cycle
         self._dashboard_poll_interval = 6.0  # seconds between ALL:READ for dashboard
@@ -737,15 +997,15 @@ class DCMonitorGateway:
                 "priority_node": pm.priority_node,
                 "total_power_mw": sum(ns.power for ns in pm.nodes.values()),
             }
-            for nid, ns in pm.nodes.items():
-                state["nodes"][nid] = {
+            for ns in pm.nodes.values():
+                state["nodes"][ns.node_id] = {
                     "role": "sensing",
                     "duty": ns.duty,
                     "voltage": ns.voltage,
                     "current": ns.current,
                     "power": ns.power,
                     "responsive": ns.responsive,
-                    "last_seen": ns.last_seen,
+                    "last_seen": ns.last_seen_wall,  # Dashboard compares wall time
                     "commanded_duty": ns.commanded_duty,
                     "target_duty": ns.target_duty,
                 }
@@ -790,62 +1050,128 @@ class DCMonitorGateway:
             # Don't crash gateway if dashboard export fails
             pass
 
+    @property
+    def app(self):
+        """TUI app reference (set by MeshGatewayApp); None when headless."""
+        return self._app
+
+    @app.setter
+    def app(self, app):
+        # Pick the log sink once here rather than re-checking on every log()
+        self._app = app
+        self._log_impl = self._log_tui if (app is not None and _HAS_TEXTUAL) else self._log_print
+
     def log(self, text: str, style: str = "", _from_thread: bool = False,
-            _debug: bool = False):
+            _debug: bool = False, _ts: Optional[float] = None):
         """Post a log message to the TUI, or print() if no TUI.
 
         Args:
             _from_thread: Set True when calling from a non-Textual thread
-                         (e.g. bleak notification callback). Uses call_from_thread
-                         for safe cross-thread posting.
+                         (e.g. bleak notification callback). The TUI log
+                         buffer is thread-safe, so this only documents intent.
             _debug: If True, only show when debug_mode is on (F2 / 'debug').
+            _ts: Optional time.time() of the event; rendered as an
+                 [HH:MM:SS] prefix when the line is actually displayed.
         """
+        self._log_impl(text, style, _from_thread, _debug, _ts)
+
+    def _log_tui(self, text, style, _from_thread, _debug, _ts):
+        app = self._app
+        if _debug and not getattr(app, 'debug_mode', False):
+            return
+        try:
+            app.queue_log(text, style, _ts)
+        except Exception as e:
+            print(f"  {text}  [log error: {e}]")
+
+    def _log_print(self, text, style, _from_thread, _debug, _ts):
         if _debug:
-            if self.app and _HAS_TEXTUAL:
-                if not getattr(self.app, 'debug_mode', False):
-                    return
-            else:
-                return  # CLI: suppress debug logs
-        if self.app and _HAS_TEXTUAL:
-            try:
-                msg = self.app.LogMsg(text, style)
-                if _from_thread:
-                    self.app.call_from_thread(self.app.post_message, msg)
-                else:
-                    self.app.post_message(msg)
-            except Exception as e:
-                print(f"  {text}  [log error: {e}]")
+            return  # CLI: suppress debug logs
+        line = f"[{_hms(_ts)}] {text}" if _ts is not None else f"  {text}"
+        if _from_thread:
+            self._print_line(line)
         else:
-            print(f"  {text}")
+            print(line)
 
-    async def scan_for_nodes(self, timeout=10.0, target_address=None):
+    def _print_line(self, line: str):
+        """Print a notification-driven line (plain CLI) without blocking the callback.
+
+        Lines are buffered and written in one go by _flush_out, at most every
+        OUT_FLUSH_INTERVAL, on the loop that connected; before that (or after
+        disconnect) they print directly.
+        """
+        loop = self._out_loop
+        if loop is None:
+            print(line)
+            return
+        self._out_buf.append(line)
+        if not self._out_pending:
+            self._out_pending = True
+            loop.call_soon_threadsafe(loop.call_later, self.OUT_FLUSH_INTERVAL, self._flush_out)
+
+    def _flush_out(self):
+        self._out_pending = False
+        buf = self._out_buf
+        if not buf:
+            return
+        lines = []
+        while buf:
+            lines.append(buf.popleft())
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+    async def scan_for_nodes(self, timeout=10.0, target_address=None, stop_on_target=False):
         """Scan for DC Monitor gateway nodes.
 
-        If target_address is given, skip name/UUID matching and just find that device.
-        Otherwise, match by name prefix or service UUID.
+        If target_address is given (one address or a list), skip name/UUID matching
+        for those devices and just find them.
+        Otherwise, match by name prefix or service UUID. Advertisements are matched
+        as they arrive. With stop_on_target only the target is looked for and the
+        scan ends as soon as it is seen (the mesh size is then not counted).
         """
         self.log(f"Scanning for BLE devices ({timeout}s)...")
 
-        devices = await BleakScanner.discover(timeout=timeout, return_adv=True)
+        # Address only: bleak stops at the first matching advertisement
+        if isinstance(target_address, str) and stop_on_target:
+            device = await BleakScanner.find_device_by_address(target_address, timeout=timeout)
+            if device:
+                self.log(f"Found target: {device.name or '(no name)'} [{device.address}]")
+                return [device]
+            self.log("No DC Monitor gateways found")
+            self.log("Tip: Make sure ESP32-C6 is powered and advertising")
+            return []
 
-        nodes = []
-        for address, (device, adv_data) in devices.items():
+        found: dict[str, object] = {}  # address -> BLEDevice, in discovery order
+        if isinstance(target_address, str):
+            target_address = [target_address]
+        targets = {a.upper() for a in target_address or ()}
+
+        def on_adv(device, adv_data):
+            address = device.address
+            if address in found:
+                return
             # If a specific address was requested, match it directly
-            if target_address and device.address.upper() == target_address.upper():
-                nodes.append(device)
-                self.log(f"Found target: {device.name or '(no name)'} [{device.address}]")
-                continue
+            if targets and address.upper() in targets:
+                found[address] = device
+                self.log(f"Found target: {device.name or '(no name)'} [{address}]")
+                return
 
             # Match by known name prefixes
-            if device.name and any(p in device.name for p in DEVICE_NAME_PREFIXES):
-                nodes.append(device)
-                self.log(f"Found: {device.name} [{device.address}]")
+            name = device.name
+            if name and name.startswith(_NAME_PREFIXES):
+                found[address] = device
+                self.log(f"Found: {name} [{address}]")
+                return
             # Match by service UUID (pre-provisioning)
-            elif adv_data.service_uuids:
-                if DC_MONITOR_SERVICE_UUID.lower() in [str(u).lower() for u in adv_data.service_uuids]:
-                    nodes.append(device)
-                    self.log(f"Found: {device.name or 'Unknown'} [{device.address}] (by service UUID)")
+            uuids = adv_data.service_uuids
+            if uuids and not _TARGET_UUIDS.isdisjoint(u.lower() for u in uuids):
+                found[address] = device
+                self.log(f"Found: {name or 'Unknown'} [{address}] (by service UUID)")
+
+        async with BleakScanner(detection_callback=on_adv):
+            await asyncio.sleep(timeout)
 
+        nodes = list(found.values())
         if not nodes:
             self.log("No DC Monitor gateways found")
             self.log("Tip: Make sure ESP32-C6 is powered and advertising")
@@ -856,116 +1182,224 @@ class DCMonitorGateway:
         """Handle incoming notifications from GATT gateway.
 
         IMPORTANT: This runs on bleak's callback thread, NOT the Textual event loop.
-        All UI updates must use call_from_thread() or log(_from_thread=True).
+        UI updates go through thread-safe app buffers (ingest_sensor, log()).
 
         Messages > 20 bytes are chunked by the gateway:
           - Continuation chunks start with '+' (data follows after the '+')
           - Final (or only) chunk has no '+' prefix
         We accumulate '+' chunks and process the full message on the final chunk.
         """
-        decoded = data.decode('utf-8', errors='replace').strip()
+        # Binary sensor frames skip text decoding, chunking and parsing
+        if data and data[0] == BIN_SENSOR_MAGIC:
+            self._on_binary_sensor_notify(data)
+            return
 
-        # Chunked reassembly: '+' prefix means more data follows
-        if decoded.startswith('+'):
-            self._chunk_buf += decoded[1:]  # Accumulate without the '+' prefix
+        # Chunked reassembly: '+' prefix means more data follows. Chunks
+        # stay raw bytes until the final one, so a message is decoded once.
+        buf = self._chunk_buf
+        if data and data[0] == 0x2B:  # '+'
+            buf += data[1:]  # Accumulate without the '+' prefix
             return  # Wait for final chunk
 
         # Final (or only) chunk - combine with any buffered data
-        if self._chunk_buf:
-            decoded = self._chunk_buf + decoded
-            self._chunk_buf = ""
-
-        timestamp = datetime.now().strftime("%H:%M:%S")
-
-        # Parse vendor model responses: NODE<id>:DATA:<sensor payload>
-        if ":DATA:" in decoded:
-            parts = decoded.split(":DATA:", 1)
-            node_tag = parts[0]  # e.g. "NODE0"
-            payload = parts[1]   # e.g. "D:50%,V:12.345V,I:1234.5MA,P:15234.5MW"
-
-            # Parse sensor values
-            sensor_match = SENSOR_RE.match(payload)
-            node_match = NODE_ID_RE.match(node_tag)
-
-            if sensor_match and node_match:
-                node_id = node_match.group(1)
-                duty = int(sensor_match.group(1))
-                voltage = float(sensor_match.group(2))
-                current = float(sensor_match.group(3))
-                power = float(sensor_match.group(4))
-
-                # Track this node as known (it actually exists and responded)
-                self.known_nodes.add(node_id)
-
-                # Cache sensor data for dashboard (persists when PM is None)
-                self._node_cache[node_id] = {
-                    "duty": duty, "voltage": voltage,
-                    "current": current, "power": power,
-                    "responsive": True, "last_seen": time.time(),
-                    "commanded_duty": duty, "target_duty": duty,
-                }
+        if buf:
+            buf += data
+            frame = bytes(buf)
+            buf.clear()
+        else:
+            frame = data
 
-                # Feed PowerManager
-                if self._power_manager:
-                    self._power_manager.on_sensor_data(
-                        node_id, duty, voltage, current, power)
+        # Formatted lazily — most packets never reach a visible log line
+        now = time.time()
 
-                # Export state for dashboard
-                self._export_mesh_state()
+        # Gateway acks are only shown in plain CLI or TUI debug mode: drop
+        # hidden ones on a bytes prefix test, before any decoding
+        if frame.startswith(b"SENT:") and self._sent_hidden():
+            return
 
-                # Signal that this node responded (unblocks event-driven pacing)
-                evt = self._node_events.get(node_id)
-                if evt:
-                    evt.set()
-
-                # Post to TUI for UI update — suppress during background dashboard poll
-                _bg_poll = self._dashboard_poll_active
-                if not _bg_poll:
-                    if self.app and _HAS_TEXTUAL:
-                        try:
-                            msg = self.app.SensorDataMsg(
-                                node_id, duty, voltage, current, power,
-                                f"[{timestamp}] {node_tag} >> {payload}"
-                            )
-                            self.app.call_from_thread(self.app.post_message, msg)
-                        except Exception as e:
-                            print(f"  [{timestamp}] {node_tag} >> {payload}  [post error: {e}]")
-                    else:
-                        print(f"[{timestamp}] {node_tag} >> {payload}")
-            else:
-                self.log(f"[{timestamp}] {node_tag} >> {payload}", _from_thread=True)
+        # Replies to a background poll echo its tag: strip it and remember.
+        # Done on bytes so swallowed poll failures are never decoded.
+        frame = frame.strip()
+        bg = frame.endswith(self._POLL_TAG_BYTES)
+        if bg:
+            frame = frame[:-len(self._POLL_TAG_BYTES)]
+            if frame.startswith((b"ERROR:", b"TIMEOUT:")):
+                return  # Background-poll errors/timeouts are never shown
+
+        # Sensor data (the bulk of traffic) is parsed straight from the bytes;
+        # everything else is decoded once and dispatched on its first field:
+        # NODE<id>:DATA:<payload>, ERROR:..., SENT:..., MESH_READY, TIMEOUT:...
+        head, _, rest = frame.partition(b':')
+        if rest.startswith(b'DATA:'):
+            self._on_sensor_notify(head, rest[5:], now, bg)
+            return
+        decoded = frame.decode('utf-8', errors='replace')
+        self._NOTIFY_HANDLERS.get(decoded.partition(':')[0],
+                                  DCMonitorGateway._on_other_notify)(self, decoded, now, bg)
+
+    def _on_sensor_notify(self, node_tag: bytes, payload: bytes, now: float, bg: bool):
+        """NODE<id>:DATA:<sensor payload> — e.g. D:50%,V:12.345V,I:1234.5MA,P:15234.5MW"""
+        parsed = _parse_sensor_payload(node_tag, payload)
+        if not parsed:
+            self.log(f"{node_tag.decode('utf-8', errors='replace')} >> "
+                     f"{payload.decode('utf-8', errors='replace')}", _from_thread=True, _ts=now)
+            return
 
-        elif decoded.startswith("ERROR:"):
-            # Suppress during PM polling or dashboard background poll
-            pm = self._power_manager
-            if (pm and pm._polling) or self._dashboard_poll_active:
-                pass  # Swallow errors during background polling (reduces TUI noise)
-            else:
-                self.log(f"[{timestamp}] !! {decoded}", style="bold red", _from_thread=True)
-        elif decoded.startswith("SENT:"):
-            # Only show in debug mode, suppress during dashboard poll
-            if not self._dashboard_poll_active:
-                if self.app and _HAS_TEXTUAL:
-                    if self.app.debug_mode:
-                        self.log(f"[{timestamp}] -> {decoded}", style="dim", _from_thread=True)
-                else:
-                    print(f"[{timestamp}] -> {decoded}")
-        elif decoded.startswith("MESH_READY"):
-            self.log(f"[{timestamp}] {decoded}", _from_thread=True)
-        elif decoded.startswith("TIMEOUT:"):
-            pm = self._power_manager
-            if (pm and pm._polling) or self._dashboard_poll_active:
-                pass  # Swallow timeouts during background polling
-            else:
-                self.log(f"[{timestamp}] !! {decoded}", style="yellow", _from_thread=True)
+        self._on_sensor_values(*parsed, now, bg, payload)
+
+    def _on_binary_sensor_notify(self, data: bytearray):
+        """0xFE binary frame — see BIN_SENSOR."""
+        now = time.time()
+        if len(data) < 1 + BIN_SENSOR.size:
+            self.log(f"!! Short binary frame ({len(data)} bytes)", style="yellow",
+                     _from_thread=True, _ts=now)
+            return
+        node, flags, duty, mv, dma, uw = BIN_SENSOR.unpack_from(data, 1)
+        voltage, current, power = mv / 1000.0, dma / 10.0, uw / 1000.0
+        payload = f"D:{duty}%,V:{voltage:.3f}V,I:{current:.1f}MA,P:{power:.1f}MW"
+        self._on_sensor_values(sys.intern(str(node)), duty, voltage, current, power, now,
+                               bool(flags & BIN_SENSOR_FLAG_POLL), payload)
+
+    def _on_sensor_values(self, node_id: str, duty: int, voltage: float,
+                          current: float, power: float, now: float, bg: bool,
+                          payload):
+        """Fan a parsed sensor reading out to caches, PowerManager and the TUI.
+
+        payload is the sensor text for the log line, as str or ASCII bytes
+        (decoded only if the line is actually shown).
+        """
+        # Track this node as known (it actually exists and responded)
+        self.known_nodes.add(node_id)
+        self._signal_op(node_id)
+
+        # A report matching our DUTY write confirms it; a different duty
+        # (RAMP, reset, PM) means the next identical request is written again
+        if self._pending_duty.get(node_id) == duty:
+            self._confirmed_duty[node_id] = self._pending_duty.pop(node_id)
+        elif self._confirmed_duty.get(node_id, duty) != duty:
+            del self._confirmed_duty[node_id]
+
+        # Cache sensor data for dashboard (persists when PM is None)
+        self._node_cache[node_id] = {
+            "duty": duty, "voltage": voltage,
+            "current": current, "power": power,
+            "responsive": True, "last_seen": now,
+            "commanded_duty": duty, "target_duty": duty,
+        }
+
+        # Feed PowerManager
+        if self._power_manager:
+            self._power_manager.on_sensor_data(
+                node_id, duty, voltage, current, power)
+
+        # Export state for dashboard
+        self._export_mesh_state()
+
+        # Signal that this node responded (unblocks event-driven pacing)
+        evt = self._node_events.get(node_id)
+        if evt:
+            evt.set()
+
+        # Post to TUI for UI update — suppress during background dashboard poll
+        if self._dashboard_poll_active:
+            return
+        app = self.app
+        if app and _HAS_TEXTUAL:
+            try:
+                # Table/sidebar take the latest reading per node at a capped
+                # rate; the log line is queued unless it's a background poll
+                app.ingest_sensor(SensorSample(node_id, duty, voltage, current, power, now))
+                if not bg or app.debug_mode:
+                    app.queue_log(_sensor_log_text(node_id, payload), "", now)
+            except Exception as e:
+                print(f"  [{_hms(now)}] {_sensor_log_text(node_id, payload)}  [post error: {e}]")
         else:
-            self.log(f"[{timestamp}] {decoded}", _from_thread=True)
+            self._print_line(f"[{_hms(now)}] {_sensor_log_text(node_id, payload)}")
+
+    def _on_error_notify(self, decoded: str, now: float, bg: bool):
+        self._signal_op()
+        # Suppress during PM polling or dashboard background poll
+        if bg or self._dashboard_poll_active:
+            return  # Swallow errors during background polling (reduces TUI noise)
+        self.log(f"!! {decoded}", style="bold red", _from_thread=True, _ts=now)
+
+    def _sent_hidden(self) -> bool:
+        """True when SENT: acks are not displayed (dashboard poll, TUI without debug)."""
+        if self._dashboard_poll_active:
+            return True
+        app = self.app
+        return bool(app and _HAS_TEXTUAL and not app.debug_mode)
+
+    def _on_sent_notify(self, decoded: str, now: float, bg: bool):
+        # Only reached when shown (see _sent_hidden): TUI debug mode or plain CLI
+        if self.app and _HAS_TEXTUAL:
+            self.log(f"-> {decoded}", style="dim", _from_thread=True, _ts=now)
+        else:
+            self._print_line(f"[{_hms(now)}] -> {decoded}")
+
+    def _on_timeout_notify(self, decoded: str, now: float, bg: bool):
+        self._signal_op()
+        if bg or self._dashboard_poll_active:
+            return  # Swallow timeouts during background polling
+        self.log(f"!! {decoded}", style="yellow", _from_thread=True, _ts=now)
+
+    def _on_other_notify(self, decoded: str, now: float, bg: bool):
+        # MESH_READY and anything unrecognised (e.g. NODE<id> status replies)
+        if decoded.startswith("NODE"):
+            self._signal_op(decoded[4:].partition(':')[0])
+        self.log(decoded, _from_thread=True, _ts=now)
+
+    def _signal_op(self, node_id: Optional[str] = None):
+        """Resolve a pending _run_op() for node_id (any node's if None).
+
+        ERROR/TIMEOUT frames don't name a node, so they end every wait.
+        SENT acks only mean the gateway forwarded the command and don't count.
+        """
+        futs = self._response_futures
+        if not futs:
+            return
+        if node_id is None:
+            for fut in list(futs.values()):
+                self._op_loop.call_soon_threadsafe(_resolve_future, fut)
+        else:
+            fut = futs.get(node_id)
+            if fut is not None:
+                self._op_loop.call_soon_threadsafe(_resolve_future, fut)
+
+    async def _run_op(self, coro, node: str, timeout: float = 2.0):
+        """Run a one-shot command, then wait for the node's reply or timeout.
+
+        ALL has no single reply to wait for, so it still waits out the timeout.
+        """
+        node = str(node)
+        if node.upper() == 'ALL':
+            await coro
+            await asyncio.sleep(timeout)
+            return
+        self._op_loop = loop = asyncio.get_running_loop()
+        fut = self._response_futures[node] = loop.create_future()
+        try:
+            await coro
+            await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            del self._response_futures[node]
+
+    _NOTIFY_HANDLERS = {
+        "ERROR": _on_error_notify,
+        "SENT": _on_sent_notify,
+        "TIMEOUT": _on_timeout_notify,
+        "MESH_READY": _on_other_notify,
+    }
 
     async def connect_to_node(self, device):
         """Connect to a specific node and subscribe to notifications"""
         self.log(f"Connecting to {device.name or device.address}...")
 
-        self.client = BleakClient(device.address)
+        self._disconnected = asyncio.Event()
+        self.client = BleakClient(device.address,
+                                  disconnected_callback=self._on_ble_disconnect)
         try:
             await self.client.connect()
         except Exception as e:
@@ -986,13 +1420,66 @@ class DCMonitorGateway:
         except Exception as e:
             self.log(f"Could not subscribe: {e}")
 
+        # Resolve the command characteristic once; bleak then skips the UUID lookup per write
+        try:
+            char = self.client.services.get_characteristic(COMMAND_CHAR_UUID)
+        except Exception:
+            char = None
+        self._cmd_char = char or COMMAND_CHAR_UUID
+        # Only fall back to acknowledged writes if the gateway says it must
+        props = getattr(char, "properties", None)
+        self._write_no_rsp = props is None or "write-without-response" in props
+
+        await self._request_fast_link()
+
         # Report negotiated MTU
         mtu = self.client.mtu_size
         self.log(f"MTU: {mtu}")
 
+        if self._app is None:
+            self._out_loop = asyncio.get_running_loop()
+
+        if self.coalesce:
+            self._write_queue = []
+            self._write_wake = asyncio.Event()
+            self._writer_task = asyncio.ensure_future(self._writer_loop())
+
         self._export_mesh_state()
         return True
 
+    async def _request_fast_link(self):
+        """Best effort: learn the real MTU and ask for a short connection interval.
+
+        bleak has no portable API for either, so this reaches into the backend
+        and quietly skips whatever the platform doesn't offer.
+        """
+        backend = getattr(self.client, "_backend", None)
+
+        # BlueZ reports MTU 23 until it is acquired (coalescing sizes batches by it)
+        acquire_mtu = getattr(backend, "_acquire_mtu", None)
+        if acquire_mtu:
+            try:
+                await acquire_mtu()
+            except Exception as e:
+                self.log(f"MTU acquire failed: {e}", _debug=True)
+
+        # Windows 11+: ask for ThroughputOptimized (short interval) link parameters.
+        # BlueZ exposes no D-Bus call for this; the peripheral's preference stands.
+        requester = getattr(backend, "_requester", None)
+        if requester is not None and hasattr(requester, "request_preferred_connection_parameters"):
+            try:
+                from winrt.windows.devices.bluetooth import (
+                    BluetoothLEPreferredConnectionParameters)
+                requester.request_preferred_connection_parameters(
+                    BluetoothLEPreferredConnectionParameters.throughput_optimized)
+            except Exception as e:
+                self.log(f"Connection parameter request failed: {e}", _debug=True)
+
+    def _on_ble_disconnect(self, client):
+        """bleak disconnected_callback; runs on the loop that connected."""
+        if self._disconnected is not None:
+            self._disconnected.set()
+
     async def disconnect(self):
         """Disconnect from current node"""
         if self.client and self.client.is_connected:
@@ -1001,26 +1488,126 @@ class DCMonitorGateway:
             except (EOFError, Exception) as e:
                 # BlueZ/dbus can throw EOFError if connection already dropped
                 pass
+            if self._out_loop is not None:
+                self._flush_out()  # Notification lines first, then our own
             self.log("Disconnected")
-        self._chunk_buf = ""  # Clear stale partial data on disconnect
+        if self._writer_task:
+            self._writer_task.cancel()
+            self._writer_task = None
+        self._write_queue = None
+        self._write_wake = None
+        self._cmd_char = COMMAND_CHAR_UUID
+        self._chunk_buf.clear()  # Clear stale partial data on disconnect
+        if self._out_loop is not None:
+            self._flush_out()  # Print whatever arrived before the link went down
+            self._out_loop = None
         self._export_mesh_state()
 
-    async def send_command(self, cmd: str, _silent: bool = False):
-        """Send raw command string to GATT gateway"""
+    async def send_command(self, cmd, _silent: bool = False):
+        """Send raw command (str, or bytes already encoded) to GATT gateway"""
+        if self._write_queue is None:
+            return await self.send_command_nodelay(cmd, _silent=_silent)
         if not self.client or not self.client.is_connected:
             self.log("Not connected")
             return False
+        # Coalescing: _writer_loop packs queued commands into one write
+        self._write_queue.append(_cmd_bytes(cmd))
+        self._write_wake.set()
+        if not _silent:
+            self.log(f"Sent: {_cmd_text(cmd)}")
+        return True
+
+    async def send_command_nodelay(self, cmd, _silent: bool = False):
+        """Write a command immediately, bypassing the coalescing window.
 
+        Commands already queued go out in the same write, ahead of this one.
+        """
+        if not self.client or not self.client.is_connected:
+            self.log("Not connected")
+            return False
+
+        if self._write_queue:
+            self._write_queue.append(_cmd_bytes(cmd))
+            await self._flush_writes()
+            if not _silent:
+                self.log(f"Sent: {_cmd_text(cmd)}")
+            return True
+
+        return await self._write_cmd(cmd, False, _silent)
+
+    async def send_command_reliable(self, cmd, _silent: bool = False):
+        """Write-with-response: returns once the gateway has acknowledged the write."""
+        if not self.client or not self.client.is_connected:
+            self.log("Not connected")
+            return False
+        if self._write_queue:
+            await self._flush_writes()  # Keep ordering with coalesced commands
+        return await self._write_cmd(cmd, True, _silent)
+
+    async def _write_cmd(self, cmd, response: bool, _silent: bool):
         try:
-            await self.client.write_gatt_char(COMMAND_CHAR_UUID, cmd.encode('utf-8'))
+            # Write-without-response by default: the gateway's SENT: notification
+            # already confirms delivery, so the GATT ack round trip is redundant
+            await self.client.write_gatt_char(self._cmd_char, _cmd_bytes(cmd),
+                                              response=response or not self._write_no_rsp)
             if not _silent:
-                self.log(f"Sent: {cmd}")
+                self.log(f"Sent: {_cmd_text(cmd)}")
             return True
         except Exception as e:
             if not _silent:
                 self.log(f"Failed to send command: {e}")
             return False
 
+    async def _writer_loop(self):
+        """Wait for queued commands, give others a moment to join, then flush."""
+        wake = self._write_wake
+        while True:
+            await wake.wait()
+            await asyncio.sleep(self.COALESCE_WINDOW)
+            wake.clear()
+            await self._flush_writes()
+
+    async def _flush_writes(self):
+        """Write queued commands joined by '\n', one write per MTU - 3 bytes."""
+        cmds = self._write_queue
+        if not cmds:
+            return
+        self._write_queue = []  # Swap first: commands queued while we write wait
+        limit = max(20, (self.client.mtu_size or 23) - 3)
+        buf = b''
+        for b in cmds:
+            if buf and len(buf) + 1 + len(b) > limit:
+                await self._write_batch(buf)
+                buf = b
+            else:
+                buf = buf + b'\n' + b if buf else b
+        await self._write_batch(buf)
+
+    async def _write_batch(self, payload: bytes):
+        """One write-without-response for a coalesced batch."""
+        try:
+            await self.client.write_gatt_char(self._cmd_char, payload,
+                                              response=not self._write_no_rsp)
+        except Exception as e:
+            self.log(f"Failed to send command: {e}")
+
+    async def send_many(self, cmds, _silent: bool = False):
+        """Send several commands concurrently, at most SEND_MANY_LIMIT at a time.
+
+        Items are raw commands or coroutines from the send helpers (set_duty,
+        stop_node, ...), which keep their duty/monitor bookkeeping. With
+        coalescing on they land in the same batch. Returns one result per item.
+        """
+        sem = asyncio.Semaphore(self.SEND_MANY_LIMIT)
+
+        async def _one(cmd):
+            async with sem:
+                if asyncio.iscoroutine(cmd):
+                    return await cmd
+                return await self.send_command(cmd, _silent=_silent)
+
+        return await asyncio.gather(*(_one(c) for c in cmds))
+
     async def _wait_node_response(self, node_id: str, timeout: float = 5.0):
         """Wait until a specific node responds, then return immediately.
 
@@ -1037,8 +1624,16 @@ class DCMonitorGateway:
         finally:
             self._node_events.pop(node_id, None)
 
+    POLL_TAG = ":POLL"  # Appended to background-poll commands; firmware echoes it back
+    _POLL_TAG_BYTES = POLL_TAG.encode('ascii')
+    # Pre-encoded pieces for send_to_node: node ids 0-9/ALL and ':VERB' suffixes
+    _NODE_BYTES = {**{str(i): str(i).encode('ascii') for i in range(10)}, "ALL": b"ALL"}
+    _VERB_BYTES = {c: f":{c}".encode('ascii')
+                   for c in ("RAMP", "STOP", "STATUS", "READ", "MONITOR", "DUTY", "ON", "OFF")}
+    _DUTY_BYTES = [f":DUTY:{i}".encode('ascii') for i in range(101)]  # set_duty, by clamped percent
+
     async def send_to_node(self, node: str, command: str, value: str = None,
-                           _silent: bool = False):
+                           _silent: bool = False, _poll_tag: bool = False):
         """Send command to a specific mesh node.
 
         When node is 'ALL', sends a single ALL:COMMAND which the GATT
@@ -1049,26 +1644,37 @@ class DCMonitorGateway:
             node: Node ID (0-9) or "ALL"
             command: RAMP, STOP, ON, OFF, DUTY, STATUS, READ
             value: Optional value (e.g. duty percentage)
+            _poll_tag: Mark as a background poll. Replies carry the tag, so
+                       the notification thread can dim them without shared state.
         """
-        if str(node).upper() == "ALL":
-            if value is not None:
-                cmd = f"ALL:{command}:{value}"
-            else:
-                cmd = f"ALL:{command}"
-            return await self.send_command(cmd, _silent=_silent)
-
+        if command not in ("DUTY", "READ", "STATUS"):
+            # RAMP/STOP/ON/OFF change the duty behind set_duty's back
+            self._forget_duty(str(node))
+
+        # Built straight as bytes from pre-encoded node ids and verbs
+        node_s = str(node)
+        target = self._NODE_BYTES.get(node_s.upper()) or node_s.encode('utf-8')
+        cmd = target + (self._VERB_BYTES.get(command) or b":" + command.encode('utf-8'))
         if value is not None:
-            cmd = f"{node}:{command}:{value}"
-        else:
-            cmd = f"{node}:{command}"
+            cmd += b":" + str(value).encode('ascii')
+        if _poll_tag:
+            cmd += self._POLL_TAG_BYTES
+        if command == "STOP":  # Safety-critical: acknowledged, never batched
+            return await self.send_command_reliable(cmd, _silent=_silent)
+        if command == "RAMP":  # Latency-sensitive: never wait on a batch
+            return await self.send_command_nodelay(cmd, _silent=_silent)
         return await self.send_command(cmd, _silent=_silent)
 
     async def set_duty(self, node: str, percent: int, _from_power_mgr: bool = False,
                        _silent: bool = False):
         """Set duty cycle (0-100%) on a mesh node"""
         percent = max(0, min(100, percent))
+        node_s = str(node)
+        is_all = node_s.upper() == "ALL"
+        if is_all:
+            node_s = "ALL"
         if self._power_manager and not _from_power_mgr:
-            if str(node).upper() == "ALL":
+            if is_all:
                 # Track target for ALL known nodes
                 pm = self._power_manager
                 if pm.nodes:
@@ -1078,9 +1684,31 @@ class DCMonitorGateway:
                     for nid in self.known_nodes:
                         pm.set_target_duty(nid, percent)
                 # else: no nodes known yet, target will be set when they respond
-            else:
-                self._power_manager.set_target_duty(str(node), percent)
-        return await self.send_to_node(node, "DUTY", str(percent), _silent=_silent)
+            elif node_s.isdigit():
+                self._power_manager.set_target_duty(node_s, percent)
+
+        if not _from_power_mgr and self._confirmed_duty.get(node_s) == percent:
+            # The node has reported running at this duty — skip the GATT write
+            if not _silent:
+                self.log(f"NODE{node_s}: duty unchanged ({percent}%), skipped")
+            return True
+        self._forget_duty(node_s)
+        # DUTY needs none of send_to_node's bookkeeping; build the command here
+        target = self._NODE_BYTES.get(node_s) or node_s.encode('utf-8')
+        ok = await self.send_command(target + self._DUTY_BYTES[percent], _silent=_silent)
+        if ok and not _from_power_mgr and not is_all:
+            # PM nudges are never cached, so a user write isn't deduped against them
+            self._pending_duty[node_s] = percent
+        return ok
+
+    def _forget_duty(self, node_s: str):
+        """Drop cached DUTY state for a node (ALL: every node) after its duty may have moved."""
+        if node_s.upper() == "ALL":
+            self._pending_duty.clear()
+            self._confirmed_duty.clear()
+        else:
+            self._pending_duty.pop(node_s, None)
+            self._confirmed_duty.pop(node_s, None)
 
     async def start_ramp(self, node: str):
         """Start ramp test on a mesh node"""
@@ -1136,6 +1764,15 @@ class DCMonitorGateway:
 
     # ---- Legacy plain CLI interactive mode (--no-tui) ----
 
+    # Plain-CLI verbs that act on the target node with no argument
+    _CLI_NODE_CMDS = {
+        's': stop_node, 'stop': stop_node,
+        'r': start_ramp, 'ramp': start_ramp,
+        'status': read_status,
+        'read': read_sensor,
+        'm': start_monitor, 'monitor': start_monitor,
+    }
+
     async def interactive_mode(self, default_node: str = "0"):
         """Interactive command mode with mesh node targeting (plain CLI)"""
         self.target_node = default_node
@@ -1165,15 +1802,61 @@ class DCMonitorGateway:
         print("=" * 50)
         print()
 
+        # Read a terminal or pipe on the event loop itself: once the fd is
+        # readable, one os.read() returns what's there without blocking, so
+        # the fd (shared with stdout on a tty) never goes non-blocking.
+        # Files, /dev/null and Windows consoles use a worker thread instead.
+        loop = asyncio.get_running_loop()
+        fd = sys.stdin.fileno()
+        reader = None
+        if sys.stdin.isatty() or stat.S_ISFIFO(os.fstat(fd).st_mode):
+            reader = asyncio.StreamReader()
+
+            def _on_stdin():
+                data = os.read(fd, 4096)
+                if data:
+                    reader.feed_data(data)
+                else:
+                    loop.remove_reader(fd)
+                    reader.feed_eof()
+
+            try:
+                loop.add_reader(fd, _on_stdin)
+            except (NotImplementedError, OSError):
+                reader = None
+
+        try:
+            await self._interactive_loop(reader)
+        finally:
+            if reader:
+                loop.remove_reader(fd)
+            if self._power_manager:
+                await self._power_manager.disable()
+            await self.disconnect()
+
+    async def _interactive_loop(self, reader):
+        """Read and run interactive commands until quit, EOF or disconnect."""
         while self.running and self.client.is_connected:
             try:
                 prompt = f"[node {self.target_node}]> "
-                cmd = await asyncio.get_event_loop().run_in_executor(
-                    None, lambda: input(prompt).strip().lower()
-                )
+                if reader:
+                    print(prompt, end="", flush=True)
+                    line = await reader.readline()
+                    if not line:  # EOF
+                        break
+                    cmd = line.decode('utf-8', errors='replace').strip().lower()
+                else:
+                    cmd = (await asyncio.to_thread(input, prompt)).strip().lower()
 
                 if not cmd:
                     continue
+                handler = self._CLI_NODE_CMDS.get(cmd)
+                if handler:
+                    await handler(self, self.target_node)
+                elif cmd.isdigit():
+                    # Bare number = duty; checked early so piped duty sweeps skip
+                    # the prefix tests below. set_duty clamps and sends pre-encoded bytes.
+                    await self.set_duty(self.target_node, int(cmd))
                 elif cmd in ['q', 'quit', 'exit']:
                     break
                 elif cmd.startswith('node'):
@@ -1182,21 +1865,11 @@ class DCMonitorGateway:
                         print("  Usage: node <0-9 or ALL>")
                         continue
                     new_node = parts[1].strip().upper()
-                    if new_node == 'ALL' or (new_node.isdigit() and 0 <= int(new_node) <= 9):
+                    if _NODE_RE.fullmatch(new_node):
                         self.target_node = new_node.lower() if new_node != 'ALL' else 'ALL'
                         print(f"  Target node: {self.target_node}")
                     else:
                         print("  Invalid node ID (use 0-9 or ALL)")
-                elif cmd in ['s', 'stop']:
-                    await self.stop_node(self.target_node)
-                elif cmd in ['r', 'ramp']:
-                    await self.start_ramp(self.target_node)
-                elif cmd == 'status':
-                    await self.read_status(self.target_node)
-                elif cmd == 'read':
-                    await self.read_sensor(self.target_node)
-                elif cmd in ['m', 'monitor']:
-                    await self.start_monitor(self.target_node)
                 elif cmd.startswith('duty'):
                     parts = cmd.split(None, 1)
                     if len(parts) < 2:
@@ -1206,8 +1879,6 @@ class DCMonitorGateway:
                     if val < 0 or val > 100:
                         print(f"  Note: duty clamped to {max(0, min(100, val))}%")
                     await self.set_duty(self.target_node, val)
-                elif cmd.isdigit():
-                    await self.set_duty(self.target_node, int(cmd))
                 elif cmd.startswith('raw'):
                     parts = cmd.split(None, 1)
                     if len(parts) < 2:
@@ -1256,21 +1927,36 @@ class DCMonitorGateway:
             except KeyboardInterrupt:
                 print("\nExiting...")
                 break
+            except EOFError:  # input() at end of stdin
+                break
             except (ValueError, IndexError):
                 print("  Invalid value or missing argument")
             except Exception as e:
                 print(f"  Error: {e}")
 
-        if self._power_manager:
-            await self._power_manager.disable()
-        await self.disconnect()
-
 
 # =============================================================================
 # Textual TUI Application
 # =============================================================================
 
-if _HAS_TEXTUAL:
+def _import_textual() -> bool:
+    """Import textual and define MeshGatewayApp on first call; return availability."""
+    global _HAS_TEXTUAL, MeshGatewayApp
+    if _HAS_TEXTUAL is not None:
+        return _HAS_TEXTUAL
+    try:
+        from textual.app import App, ComposeResult
+        from textual.containers import Horizontal, Vertical
+        from textual.message import Message
+        from textual.widgets import Header, Footer, Input, RichLog, DataTable, Static
+        from textual import work, on
+        from rich.highlighter import ReprHighlighter
+        from rich.text import Text
+    except ImportError as e:
+        print(f"Note: textual not available ({e}). Install with: pip install textual")
+        print("      Falling back to plain CLI mode.\n")
+        _HAS_TEXTUAL = False
+        return False
 
     class MeshGatewayApp(App):
         """Textual TUI for the BLE Mesh Gateway."""
@@ -1307,25 +1993,6 @@ if _HAS_TEXTUAL:
 
         # ---- Custom Messages ----
 
-        class SensorDataMsg(Message):
-            """Sensor data arrived from a mesh node."""
-            def __init__(self, node_id: str, duty: int, voltage: float,
-                         current: float, power: float, raw: str):
-                super().__init__()
-                self.node_id = node_id
-                self.duty = duty
-                self.voltage = voltage
-                self.current = current
-                self.power = power
-                self.raw = raw
-
-        class LogMsg(Message):
-            """Generic log line for the RichLog panel."""
-            def __init__(self, text: str, style: str = ""):
-                super().__init__()
-                self.text = text
-                self.style = style
-
         class PowerAdjustMsg(Message):
             """PowerManager made an adjustment."""
             def __init__(self, summary: str):
@@ -1346,13 +2013,39 @@ if _HAS_TEXTUAL:
             self._connected = False
             self._ble_thread = BleThread()
             self.gateway.ble_thread = self._ble_thread
+            # Widgets, resolved once in on_mount (no selector walk per update)
+            self._log_widget: Optional[RichLog] = None
+            self._table: Optional[DataTable] = None
+            self._sidebar_header: Optional[Static] = None
+            self._sidebar_power: Optional[Static] = None
+            self._sidebar_totals: Optional[Static] = None
+            self._sidebar_text: dict = {}  # Last text pushed to each sidebar Static
+            self._sidebar_lines: list[str] = []  # Reused by update_status
+            self._totals_dirty = False  # New readings since totals were drawn
+            self._sidebar_dirty = False  # A command changed sidebar state
+            self._ble_batch: Optional[list] = None  # BLE coroutines queued by a ';' line
+            self._input: Optional[Input] = None
+            self._col_keys: list = []  # Column keys from add_columns, in row order
+            self._table_rows: set[str] = set()  # Row keys already added to the table
+            # Interned row keys per node id; parsers intern node ids too
+            self._row_keys: dict[str, str] = {str(i): sys.intern(f"node_{i}") for i in range(10)}
+            self._row_keys['ALL'] = sys.intern('node_ALL')
+            self._row_scratch: list = [None] * 7  # Reused by _update_node_table
+            # Pending (text, style, ts) log lines, drained by _drain_log
+            self._log_buf: deque = deque(maxlen=self.LOG_BUF_SIZE)
+            # Latest reading per node, swapped out by _flush_sensor_batch
+            self._pending_sensor: dict[str, SensorSample] = {}
+            self._ingest_lock = threading.Lock()
 
         # ---- Layout ----
 
         def compose(self) -> ComposeResult:
             yield Header()
             with Horizontal():
-                yield Static("Connecting...", id="sidebar")
+                with Vertical(id="sidebar"):
+                    yield Static("Connecting...", id="sidebar-header")
+                    yield Static(id="sidebar-power")
+                    yield Static(id="sidebar-totals")
                 yield RichLog(id="log", wrap=True, highlight=True, markup=True)
             yield DataTable(id="nodes-table")
             yield Input(placeholder="Enter command (type 'help' for list)", id="cmd-input")
@@ -1360,11 +2053,21 @@ if _HAS_TEXTUAL:
 
         def on_mount(self) -> None:
             """Initialize table and start BLE connection."""
-            table = self.query_one("#nodes-table", DataTable)
-            table.add_columns("ID", "Duty", "Target", "Voltage", "Current", "Power", "Status")
+            self._log_widget = self.query_one("#log", RichLog)
+            self._table = table = self.query_one("#nodes-table", DataTable)
+            self._sidebar_header = self.query_one("#sidebar-header", Static)
+            self._sidebar_power = self.query_one("#sidebar-power", Static)
+            self._sidebar_totals = self.query_one("#sidebar-totals", Static)
+            self._input = self.query_one("#cmd-input", Input)
+            self._col_keys = table.add_columns(
+                "ID", "Duty", "Target", "Voltage", "Current", "Power", "Status")
             table.cursor_type = "none"
             # Focus the input
-            self.query_one("#cmd-input", Input).focus()
+            self._input.focus()
+            # Coalesced sensor updates: at most one table/sidebar redraw per tick
+            self.set_interval(self.SENSOR_FLUSH_INTERVAL, self._flush_sensor_batch)
+            self.set_interval(self.LOG_DRAIN_INTERVAL, self._drain_log)
+            self.set_interval(self.TOTALS_INTERVAL, self._refresh_totals)
             # Start BLE I/O thread before any BLE operations
             self._ble_thread.start()
             # Start BLE connection
@@ -1378,7 +2081,7 @@ if _HAS_TEXTUAL:
             gw = self.gateway
             bt = self._ble_thread
 
-            devices = await bt.submit_async(
+            devices = await bt.run_coro(
                 gw.scan_for_nodes(timeout=self.scan_timeout, target_address=self.target_address)
             )
 
@@ -1396,7 +2099,7 @@ if _HAS_TEXTUAL:
                 device = devices[0]
 
             # Connect (start_notify binds D-Bus handlers to BLE thread's loop)
-            success = await bt.submit_async(gw.connect_to_node(device))
+            success = await bt.run_coro(gw.connect_to_node(device))
             if success:
                 # Derive sensing node count from the BLE scan:
                 # total mesh devices found - 1 (the GATT gateway we just connected to)
@@ -1410,8 +2113,8 @@ if _HAS_TEXTUAL:
 
                 # Auto-discover mesh nodes for the dashboard
                 self.log_message("Auto-discovering mesh nodes...")
-                await bt.submit_async(asyncio.sleep(1.0))
-                await bt.submit_async(gw.send_to_node("ALL", "READ", _silent=True))
+                await bt.run_coro(asyncio.sleep(1.0))
+                await bt.run_coro(gw.send_to_node("ALL", "READ", _silent=True))
 
                 # Start background dashboard poll loop
                 self.start_dashboard_poll()
@@ -1423,7 +2126,7 @@ if _HAS_TEXTUAL:
             """Run dashboard poll loop on the BLE thread."""
             gw = self.gateway
             bt = self._ble_thread
-            await bt.submit_async(gw._dashboard_poll_loop())
+            await bt.run_coro(gw._dashboard_poll_loop())
 
         # ---- Command Handling ----
 
@@ -1431,135 +2134,214 @@ if _HAS_TEXTUAL:
         def on_cmd_submitted(self, event: Input.Submitted) -> None:
             """Handle command input."""
             cmd = event.value.strip()
-            event.input.value = ""
-            if cmd:
-                self.log_message(f"> {cmd}", style="bold cyan")
-                self.dispatch_command(cmd.lower())
+            if event.value:  # Cached widget; skip the watcher when already empty
+                self._input.value = ""
+            if not cmd:
+                return
+            self.log_message(f"> {cmd}", style="bold cyan")
+            self.dispatch_command(cmd.lower())
 
         @work(exclusive=True, group="cmd")
         async def dispatch_command(self, cmd: str) -> None:
-            """Parse and execute a user command via BLE thread."""
-            gw = self.gateway
-            bt = self._ble_thread
+            """Parse and execute a user command via BLE thread.
+
+            'a; b; c' runs several commands; their BLE work is queued by _ble()
+            and handed to the BLE thread in a single submit_many() call.
+            """
+            subcmds = [c.strip() for c in cmd.split(';')] if ';' in cmd else [cmd]
+            if len(subcmds) > 1:
+                self._ble_batch = []
             try:
-                if cmd in ['q', 'quit', 'exit']:
-                    if gw._power_manager:
-                        await bt.submit_async(gw._power_manager.disable())
-                    await bt.submit_async(gw.disconnect())
-                    bt.stop()
-                    self.exit()
-
-                elif cmd.startswith('node'):
-                    parts = cmd.split(None, 1)
-                    if len(parts) < 2:
-                        self.log_message("Usage: node <0-9 or ALL>")
-                        return
-                    new_node = parts[1].strip().upper()
-                    if new_node == 'ALL' or (new_node.isdigit() and 0 <= int(new_node) <= 9):
-                        gw.target_node = new_node.lower() if new_node != 'ALL' else 'ALL'
-                        self.log_message(f"Target node: {gw.target_node}")
-                    else:
-                        self.log_message("Invalid node ID (use 0-9 or ALL)")
-
-                elif cmd in ['s', 'stop']:
-                    was_monitoring = gw._monitoring
-                    await bt.submit_async(gw.stop_node(gw.target_node))
-                    if was_monitoring:
-                        self.log_message("Monitoring stopped")
-
-                elif cmd in ['r', 'ramp']:
-                    await bt.submit_async(gw.start_ramp(gw.target_node))
-
-                elif cmd == 'status':
-                    await bt.submit_async(gw.read_status(gw.target_node))
-
-                elif cmd == 'read':
-                    await bt.submit_async(gw.read_sensor(gw.target_node))
+                for sub in subcmds:
+                    if sub:
+                        await self._run_command(sub)
+                await self._flush_ble()
+            except Exception as e:
+                self.log_message(f"Error: {e}", style="bold red")
+            finally:
+                if self._ble_batch:
+                    for c in self._ble_batch:
+                        c.close()
+                self._ble_batch = None
+
+            # Only commands that touch target/monitor/PM settings redraw the sidebar
+            if self._sidebar_dirty:
+                self._sidebar_dirty = False
+                self.update_status()
 
-                elif cmd in ['m', 'monitor']:
-                    await bt.submit_async(gw.start_monitor(gw.target_node))
+        async def _run_command(self, cmd: str) -> None:
+            """Look up and run a single command."""
+            try:
+                # One split: handlers get the argument already stripped
+                verb, _, arg = cmd.partition(' ')
+                arg = arg.strip()
+                handler = self._CMDS.get(verb)
+                if handler is None and verb.isdigit() and not arg:
+                    handler, arg = MeshGatewayApp._cmd_duty, verb  # bare number = duty
+                if handler is None:
+                    self.log_message("Unknown command. Type 'help' for list.")
+                else:
+                    await handler(self, arg)
+            except (ValueError, IndexError):
+                self.log_message("Invalid value or missing argument")
+            except Exception as e:
+                self.log_message(f"Error: {e}", style="bold red")
 
-                elif cmd.startswith('duty'):
-                    parts = cmd.split(None, 1)
-                    if len(parts) < 2:
-                        self.log_message("Usage: duty <0-100>")
-                        return
-                    val = int(parts[1])
-                    if val < 0 or val > 100:
-                        self.log_message(f"Note: duty clamped to {max(0, min(100, val))}%")
-                    await bt.submit_async(gw.set_duty(gw.target_node, val))
+        async def _ble(self, coro) -> None:
+            """Run coro on the BLE thread, or queue it while a ';' line is parsed."""
+            if self._ble_batch is not None:
+                self._ble_batch.append(coro)
+            else:
+                await self._ble_thread.run_coro(coro)
 
-                elif cmd.isdigit():
-                    await bt.submit_async(gw.set_duty(gw.target_node, int(cmd)))
+        async def _flush_ble(self) -> None:
+            """Submit queued BLE work, in order, with one cross-thread hop."""
+            batch = self._ble_batch
+            if batch:
+                self._ble_batch = []
+                for r in await self._ble_thread.submit_many(batch):
+                    if isinstance(r, Exception):
+                        self.log_message(f"Error: {r}", style="bold red")
 
-                elif cmd.startswith('raw'):
-                    parts = cmd.split(None, 1)
-                    if len(parts) < 2:
-                        self.log_message("Usage: raw <command>")
-                        return
-                    await bt.submit_async(gw.send_command(parts[1].upper()))
+        # ---- Command Handlers ----
+        # Each takes the stripped argument after the verb ('' if none); see _CMDS.
 
-                elif cmd.startswith('threshold'):
-                    parts = cmd.split(None, 1)
-                    if len(parts) < 2:
-                        self.log_message("Usage: threshold <mW> or threshold off")
-                        return
-                    arg = parts[1].strip()
-                    if arg == 'off':
-                        if gw._power_manager:
-                            await bt.submit_async(gw._power_manager.disable())
-                            self.workers.cancel_group(self, "power_poll")
-                            self.notify("Threshold disabled", severity="information")
-                    else:
-                        mw = float(arg)
-                        if not gw._power_manager:
-                            gw._power_manager = PowerManager(gw)
-                        gw._power_manager.set_threshold(mw)
-                        self.start_power_poll()
-                        self.notify(f"Threshold: {mw:.0f} mW", severity="information")
+        async def _cmd_quit(self, arg: str) -> None:
+            gw = self.gateway
+            bt = self._ble_thread
+            await self._flush_ble()  # queued ';' commands go out before we disconnect
+            if gw._power_manager:
+                await bt.run_coro(gw._power_manager.disable())
+            await bt.run_coro(gw.disconnect())
+            bt.stop()
+            self.exit()
+
+        async def _cmd_node(self, arg: str) -> None:
+            gw = self.gateway
+            if not arg:
+                self.log_message("Usage: node <0-9 or ALL>")
+                return
+            new_node = arg.upper()
+            if _NODE_RE.fullmatch(new_node):
+                gw.target_node = new_node.lower() if new_node != 'ALL' else 'ALL'
+                self._sidebar_dirty = True
+                self.log_message(f"Target node: {gw.target_node}")
+            else:
+                self.log_message("Invalid node ID (use 0-9 or ALL)")
 
-                elif cmd.startswith('priority'):
-                    parts = cmd.split(None, 1)
-                    if len(parts) < 2:
-                        self.log_message("Usage: priority <node_id> or priority off")
-                        return
-                    arg = parts[1].strip()
-                    if arg == 'off':
-                        if gw._power_manager:
-                            gw._power_manager.clear_priority()
-                            self.notify("Priority cleared", severity="information")
-                    elif gw._power_manager:
-                        if not (arg.isdigit() and 0 <= int(arg) <= 9):
-                            self.log_message(f"Warning: '{arg}' may not be a valid node ID (expected 0-9)")
-                        gw._power_manager.set_priority(arg)
-                        self.notify(f"Priority: node {arg}", severity="information")
-                    else:
-                        self.log_message("Set a threshold first")
+        async def _cmd_stop(self, arg: str) -> None:
+            gw = self.gateway
+            was_monitoring = gw._monitoring
+            await self._ble(gw.stop_node(gw.target_node))
+            if was_monitoring:
+                self._sidebar_dirty = True
+                self.log_message("Monitoring stopped")
 
-                elif cmd == 'power':
-                    if gw._power_manager:
-                        self.log_message(gw._power_manager.status())
-                    else:
-                        self.log_message("Power management not active. Use: threshold <mW>")
+        async def _cmd_ramp(self, arg: str) -> None:
+            gw = self.gateway
+            await self._ble(gw.start_ramp(gw.target_node))
 
-                elif cmd in ['d', 'debug']:
-                    self.action_toggle_debug()
+        async def _cmd_status(self, arg: str) -> None:
+            gw = self.gateway
+            await self._ble(gw.read_status(gw.target_node))
 
-                elif cmd in ['clear', 'cls']:
-                    self.action_clear_log()
+        async def _cmd_read(self, arg: str) -> None:
+            gw = self.gateway
+            await self._ble(gw.read_sensor(gw.target_node))
 
-                elif cmd == 'help':
-                    self._show_help()
+        async def _cmd_monitor(self, arg: str) -> None:
+            gw = self.gateway
+            self._sidebar_dirty = True
+            await self._ble(gw.start_monitor(gw.target_node))
 
-                else:
-                    self.log_message("Unknown command. Type 'help' for list.")
+        async def _cmd_duty(self, arg: str) -> None:
+            gw = self.gateway
+            if not arg:
+                self.log_message("Usage: duty <0-100>")
+                return
+            val = int(arg)
+            if val < 0 or val > 100:
+                self.log_message(f"Note: duty clamped to {max(0, min(100, val))}%")
+            await self._ble(gw.set_duty(gw.target_node, val))
+
+        async def _cmd_raw(self, arg: str) -> None:
+            if not arg:
+                self.log_message("Usage: raw <command>")
+                return
+            await self._ble(self.gateway.send_command(arg.upper()))
 
-            except (ValueError, IndexError):
-                self.log_message("Invalid value or missing argument")
-            except Exception as e:
-                self.log_message(f"Error: {e}", style="bold red")
+        async def _cmd_threshold(self, arg: str) -> None:
+            gw = self.gateway
+            if not arg:
+                self.log_message("Usage: threshold <mW> or threshold off")
+                return
+            self._sidebar_dirty = True
+            if arg == 'off':
+                if gw._power_manager:
+                    await self._flush_ble()
+                    await self._ble_thread.run_coro(gw._power_manager.disable())
+                    self.workers.cancel_group(self, "power_poll")
+                    self.notify("Threshold disabled", severity="information")
+            else:
+                mw = float(arg)
+                if not gw._power_manager:
+                    gw._power_manager = PowerManager(gw)
+                gw._power_manager.set_threshold(mw)
+                self.start_power_poll()
+                self.notify(f"Threshold: {mw:.0f} mW", severity="information")
+
+        async def _cmd_priority(self, arg: str) -> None:
+            gw = self.gateway
+            if not arg:
+                self.log_message("Usage: priority <node_id> or priority off")
+                return
+            self._sidebar_dirty = True
+            if arg == 'off':
+                if gw._power_manager:
+                    gw._power_manager.clear_priority()
+                    self.notify("Priority cleared", severity="information")
+            elif gw._power_manager:
+                if not (arg.isdigit() and 0 <= int(arg) <= 9):
+                    self.log_message(f"Warning: '{arg}' may not be a valid node ID (expected 0-9)")
+                gw._power_manager.set_priority(arg)
+                self.notify(f"Priority: node {arg}", severity="information")
+            else:
+                self.log_message("Set a threshold first")
 
-            self.update_status()
+        async def _cmd_power(self, arg: str) -> None:
+            pm = self.gateway._power_manager
+            if pm:
+                self.log_message(pm.status())
+            else:
+                self.log_message("Power management not active. Use: threshold <mW>")
+
+        async def _cmd_debug(self, arg: str) -> None:
+            self.action_toggle_debug()
+
+        async def _cmd_clear(self, arg: str) -> None:
+            self.action_clear_log()
+
+        async def _cmd_help(self, arg: str) -> None:
+            self._show_help()
+
+        # Command verb -> handler
+        _CMDS = {
+            'q': _cmd_quit, 'quit': _cmd_quit, 'exit': _cmd_quit,
+            's': _cmd_stop, 'stop': _cmd_stop,
+            'r': _cmd_ramp, 'ramp': _cmd_ramp,
+            'status': _cmd_status,
+            'read': _cmd_read,
+            'm': _cmd_monitor, 'monitor': _cmd_monitor,
+            'power': _cmd_power,
+            'd': _cmd_debug, 'debug': _cmd_debug,
+            'clear': _cmd_clear, 'cls': _cmd_clear,
+            'help': _cmd_help,
+            'node': _cmd_node,
+            'duty': _cmd_duty,
+            'raw': _cmd_raw,
+            'threshold': _cmd_threshold,
+            'priority': _cmd_priority,
+        }
 
         # ---- Power Poll Worker ----
 
@@ -1579,73 +2361,101 @@ if _HAS_TEXTUAL:
         # Textual auto-discovers handlers named on_<namespace>_<message_name>
         # where namespace = snake_case of outermost widget class.
 
-        def on_mesh_gateway_app_sensor_data_msg(self, msg: SensorDataMsg) -> None:
-            """Handle incoming sensor data — update table and optionally log."""
-            self._update_node_table(msg)
-            self.update_status()
-
-            # Show in log unless it's a background PM poll
-            pm = self.gateway._power_manager
-            is_bg_poll = pm and pm._polling and pm.threshold_mw is not None
-            if not is_bg_poll or self.debug_mode:
-                log = self.query_one("#log", RichLog)
-                log.write(msg.raw)
-
-        def on_mesh_gateway_app_log_msg(self, msg: LogMsg) -> None:
-            """Handle generic log messages."""
-            log = self.query_one("#log", RichLog)
-            if msg.style:
-                log.write(f"[{msg.style}]{msg.text}[/{msg.style}]")
-            else:
-                log.write(msg.text)
-
         def on_mesh_gateway_app_power_adjust_msg(self, msg: PowerAdjustMsg) -> None:
             """Handle power adjustment notification."""
             self.update_status()
 
         # ---- UI Updates ----
 
-        def _update_node_table(self, msg: SensorDataMsg) -> None:
+        SENSOR_FLUSH_INTERVAL = 0.04  # seconds; caps node-table redraws at 25 Hz
+        TOTALS_INTERVAL = 0.25        # seconds; caps sidebar power-total redraws
+        LOG_DRAIN_INTERVAL = 0.05     # seconds between RichLog writes
+        LOG_DRAIN_MAX = 200           # lines per write; the rest wait for the next tick
+        LOG_BUF_SIZE = 2000           # oldest pending lines drop beyond this
+
+        def queue_log(self, text: str, style: str = "", ts: float = None) -> None:
+            """Buffer a log line for the next drain (safe from any thread)."""
+            self._log_buf.append((text, style, ts))
+
+        def _drain_log(self) -> None:
+            """Write up to LOG_DRAIN_MAX buffered lines to the log as one renderable."""
+            buf = self._log_buf
+            if not buf:
+                return
+            lines = []
+            for _ in range(min(len(buf), self.LOG_DRAIN_MAX)):
+                text, style, ts = buf.popleft()
+                if ts is not None:
+                    text = f"[{_hms(ts)}] {text}"  # [HH:MM:SS] formatted on display
+                lines.append(f"[{style}]{text}[/{style}]" if style else text)
+            self._log_widget.write("\n".join(lines))
+
+        def ingest_sensor(self, msg: SensorSample) -> None:
+            """Stash a reading for the next flush (safe from the bleak thread).
+
+            Latest wins: an older reading for the same node that was never
+            drawn is simply replaced, so memory stays O(nodes).
+            """
+            with self._ingest_lock:
+                self._pending_sensor[msg.node_id] = msg
+
+        def _flush_sensor_batch(self) -> None:
+            """Apply pending readings to the table; totals redraw on their own timer."""
+            if not self._pending_sensor:
+                return
+            with self._ingest_lock:
+                pending, self._pending_sensor = self._pending_sensor, {}
+            with self.batch_update():
+                for msg in pending.values():  # arrival order keeps new rows sorted
+                    self._update_node_table(msg)
+            self._totals_dirty = True
+
+        def _update_node_table(self, msg: SensorSample) -> None:
             """Update or insert a row in the nodes DataTable."""
-            table = self.query_one("#nodes-table", DataTable)
+            table = self._table
             pm = self.gateway._power_manager
-            row_key = f"node_{msg.node_id}"
-
-            # Get target duty
-            if pm and msg.node_id in pm.nodes:
-                target = pm.nodes[msg.node_id].target_duty
+            row_key = self._row_keys.get(msg.node_id)
+            if row_key is None:  # Node id outside 0-9
+                row_key = self._row_keys[msg.node_id] = sys.intern(f"node_{msg.node_id}")
+
+            # Target duty and responsive status come from the PM when it tracks the node
+            ns = pm.nodes.get(int(msg.node_id)) if pm else None
+            if ns:
+                target = ns.target_duty
+                status_icon = "ok" if ns.responsive else "STALE"
             else:
                 target = msg.duty
-
-            # Get responsive status
-            if pm and msg.node_id in pm.nodes:
-                status_icon = "ok" if pm.nodes[msg.node_id].responsive else "STALE"
-            else:
                 status_icon = "ok"
 
-            row_data = [
-                msg.node_id,
-                f"{msg.duty}%",
-                f"{target}%",
-                f"{msg.voltage:.2f}V",
-                f"{msg.current:.1f}mA",
-                f"{msg.power:.0f}mW",
-                status_icon,
-            ]
-
-            # Try to update existing row, add if not found
-            if row_key in table.rows:
-                col_keys = list(table.columns.keys())
-                for col_idx, val in enumerate(row_data):
-                    table.update_cell(row_key, col_keys[col_idx], val)
-            else:
+            # Reused scratch row; %-formatting skips format-spec dispatch
+            row_data = self._row_scratch
+            row_data[0] = msg.node_id
+            row_data[1] = "%d%%" % msg.duty
+            row_data[2] = "%d%%" % target
+            row_data[3] = "%.2fV" % msg.voltage
+            row_data[4] = "%.1fmA" % msg.current
+            row_data[5] = "%.0fmW" % msg.power
+            row_data[6] = status_icon
+
+            if row_key not in self._table_rows:
                 table.add_row(*row_data, key=row_key)
+                self._table_rows.add(row_key)
+                return
+            update_cell = table.update_cell
+            for col_key, val in zip(self._col_keys, row_data):
+                update_cell(row_key, col_key, val)
 
         def update_status(self) -> None:
-            """Refresh the sidebar with current state."""
+            """Refresh the sidebar after a state change (connect, command, PM).
+
+            Header and power settings are redrawn here; the power totals,
+            which move with every reading, are left to _refresh_totals.
+            """
             gw = self.gateway
             pm = gw._power_manager
-            lines = ["[bold]Status[/bold]", ""]
+            lines = self._sidebar_lines
+            del lines[:]  # Reuse the list across redraws
+            lines += ("[bold]Status[/bold]", "")
 
             # Connection
             if self._connected:
@@ -1661,72 +2471,94 @@ if _HAS_TEXTUAL:
             if gw._monitoring:
                 lines.append("[cyan]Monitoring ●[/cyan]")
 
-            # Power management
-            lines.append("")
-            if pm and pm.threshold_mw is not None:
-                budget = pm.threshold_mw - pm.HEADROOM_MW
-                lines.append("[bold]Power Mgmt[/bold]")
-                lines.append(f"Threshold: {pm.threshold_mw:.0f}mW")
-                lines.append(f"Budget:    {budget:.0f}mW")
-                if pm.priority_node:
-                    lines.append(f"Priority:  N{pm.priority_node}")
-                else:
-                    lines.append("Priority:  none")
-
-                total = sum(ns.power for ns in pm.nodes.values() if ns.responsive)
-                headroom = pm.threshold_mw - total
-                lines.append(f"\nTotal: {total:.0f}mW")
-                if headroom >= pm.HEADROOM_MW:
-                    lines.append(f"Headroom: [green]{headroom:.0f}mW[/green]")
-                elif headroom >= 0:
-                    lines.append(f"Headroom: [yellow]{headroom:.0f}mW[/yellow]")
-                else:
-                    lines.append(f"Headroom: [red]{headroom:.0f}mW[/red]")
-
-                # Node count
-                responsive = sum(1 for ns in pm.nodes.values() if ns.responsive)
-                total_nodes = len(pm.nodes)
-                lines.append(f"Nodes: {responsive}/{total_nodes}")
-            else:
-                lines.append("[dim]Power: OFF[/dim]")
-
             # Debug mode
             if self.debug_mode:
-                lines.append("\n[yellow]DEBUG ON[/yellow]")
+                lines.append("[yellow]DEBUG ON[/yellow]")
+            self._set_sidebar(self._sidebar_header, "\n".join(lines))
+
+            # Power management settings
+            threshold = pm.threshold_mw if pm else None
+            if threshold is not None:
+                priority = pm.priority_node
+                power = (f"\n[bold]Power Mgmt[/bold]\n"
+                         f"Threshold: {threshold:.0f}mW\n"
+                         f"Budget:    {threshold - pm.HEADROOM_MW:.0f}mW\n"
+                         f"Priority:  {'N' + priority if priority else 'none'}")
+            else:
+                power = "\n[dim]Power: OFF[/dim]"
+            self._set_sidebar(self._sidebar_power, power)
 
-            try:
-                self.query_one("#sidebar", Static).update("\n".join(lines))
-            except Exception:
-                pass
+            self._totals_dirty = True
+            self._refresh_totals()
+
+        def _refresh_totals(self) -> None:
+            """Redraw total power, headroom and node count if readings changed."""
+            if not self._totals_dirty:
+                return
+            self._totals_dirty = False
+            # Snapshot PM state into locals: one pass, no repeated attribute lookups
+            pm = self.gateway._power_manager
+            threshold = pm.threshold_mw if pm else None
+            if threshold is None:
+                self._set_sidebar(self._sidebar_totals, "")
+                return
+
+            nodes = pm.nodes
+            total = 0.0
+            responsive = 0
+            for ns in nodes.values():
+                if ns.responsive:
+                    total += ns.power
+                    responsive += 1
+            headroom = threshold - total
+            if headroom >= pm.HEADROOM_MW:
+                color = "green"
+            elif headroom >= 0:
+                color = "yellow"
+            else:
+                color = "red"
+            self._set_sidebar(
+                self._sidebar_totals,
+                f"\nTotal: {total:.0f}mW\n"
+                f"Headroom: [{color}]{headroom:.0f}mW[/{color}]\n"
+                f"Nodes: {responsive}/{len(nodes)}")
+
+        def _set_sidebar(self, widget: Optional[Static], text: str) -> None:
+            """Update a sidebar Static only when its text actually changed."""
+            if widget is None or self._sidebar_text.get(widget.id) == text:
+                return
+            self._sidebar_text[widget.id] = text
+            widget.update(text)
+
+        # Parsed and highlighted once when the class is built; write() takes it as-is
+        _HELP_TEXT = ReprHighlighter()(Text.from_markup(
+            "[bold]--- Commands ---[/bold]\n"
+            "  node <id>      Switch target (0-9 or ALL)\n"
+            "  ramp / r       Send RAMP to target node\n"
+            "  stop / s       Send STOP to target node\n"
+            "  duty <0-100>   Set duty cycle on target node\n"
+            "  status         Get status from target node\n"
+            "  read           Single sensor reading\n"
+            "  monitor / m    Start continuous monitoring\n"
+            "  raw <cmd>      Send raw command string\n"
+            "\n"
+            "[bold]--- Power Management ---[/bold]\n"
+            "  threshold <mW> Set total power limit\n"
+            "  priority <id>  Set priority node\n"
+            "  threshold off  Disable power management\n"
+            "  priority off   Clear priority node\n"
+            "  power          Show power manager status\n"
+            "\n"
+            "[bold]--- Keys / Misc ---[/bold]\n"
+            "  debug / d      Toggle debug mode (or F2)\n"
+            "  clear / cls    Clear log (or F3)\n"
+            "  Esc            Focus input\n"
+            "  q / quit       Quit"
+        ))
 
         def _show_help(self):
             """Display help text in the log."""
-            help_text = (
-                "[bold]--- Commands ---[/bold]\n"
-                "  node <id>      Switch target (0-9 or ALL)\n"
-                "  ramp / r       Send RAMP to target node\n"
-                "  stop / s       Send STOP to target node\n"
-                "  duty <0-100>   Set duty cycle on target node\n"
-                "  status         Get status from target node\n"
-                "  read           Single sensor reading\n"
-                "  monitor / m    Start continuous monitoring\n"
-                "  raw <cmd>      Send raw command string\n"
-                "\n"
-                "[bold]--- Power Management ---[/bold]\n"
-                "  threshold <mW> Set total power limit\n"
-                "  priority <id>  Set priority node\n"
-                "  threshold off  Disable power management\n"
-                "  priority off   Clear priority node\n"
-                "  power          Show power manager status\n"
-                "\n"
-                "[bold]--- Keys / Misc ---[/bold]\n"
-                "  debug / d      Toggle debug mode (or F2)\n"
-                "  clear / cls    Clear log (or F3)\n"
-                "  Esc            Focus input\n"
-                "  q / quit       Quit"
-            )
-            log = self.query_one("#log", RichLog)
-            log.write(help_text)
+            self._log_widget.write(self._HELP_TEXT)
 
         # ---- Actions ----
 
@@ -1738,28 +2570,38 @@ if _HAS_TEXTUAL:
 
         def action_clear_log(self) -> None:
             """Clear the log panel."""
-            self.query_one("#log", RichLog).clear()
+            self._log_widget.clear()
 
         def action_focus_input(self) -> None:
             """Focus the command input."""
-            self.query_one("#cmd-input", Input).focus()
+            self._input.focus()
 
         def log_message(self, text: str, style: str = ""):
-            """Convenience: post a LogMsg."""
-            self.post_message(self.LogMsg(text, style))
+            """Convenience: queue a log line."""
+            self.queue_log(text, style)
+
+        DISCONNECT_TIMEOUT = 0.25  # seconds the exit path allows for BLE disconnect
 
         def on_unmount(self) -> None:
             """Clean up BLE thread when app exits."""
             self.gateway._dashboard_polling = False
             self.workers.cancel_group(self, "dashboard_poll")
-            if self._ble_thread:
+            bt = self._ble_thread
+            if bt:
+                gw = self.gateway
                 try:
-                    if self.gateway.client and self.gateway.client.is_connected:
-                        f = self._ble_thread.submit(self.gateway.disconnect())
-                        f.result(timeout=3.0)
+                    if gw.client and gw.client.is_connected:
+                        # Don't block exit on a wedged adapter: bound the
+                        # disconnect and let the BLE thread stop when it's done
+                        f = bt.submit(asyncio.wait_for(gw.disconnect(), self.DISCONNECT_TIMEOUT))
+                        f.add_done_callback(lambda _: bt.stop(wait=False))
+                        return
                 except Exception:
                     pass
-                self._ble_thread.stop()
+                bt.stop()
+
+    _HAS_TEXTUAL = True
+    return True
 
 
 # =============================================================================
@@ -1770,7 +2612,8 @@ def main():
     """Entry point — decides between TUI and CLI mode."""
     parser = argparse.ArgumentParser(description="BLE Gateway for DC Monitor Mesh")
     parser.add_argument("--scan", action="store_true", help="Scan for gateways only")
-    parser.add_argument("--address", type=str, help="Connect to specific MAC address")
+    parser.add_argument("--address", type=str, action="append",
+                        help="Connect to specific MAC address (repeat for several gateways)")
     parser.add_argument("--node", type=str, default="0",
                         help="Target mesh node ID (0-9 or ALL, default: 0)")
     parser.add_argument("--duty", type=int, help="Set duty cycle (0-100%%)")
@@ -1782,10 +2625,16 @@ def main():
     parser.add_argument("--timeout", type=float, default=10.0, help="Scan timeout")
     parser.add_argument("--no-tui", action="store_true",
                         help="Use plain CLI mode instead of TUI")
+    parser.add_argument("--coalesce", action="store_true",
+                        help="Batch command writes up to the MTU (firmware must split on newlines)")
     args = parser.parse_args()
 
+    # Every loop from here on (asyncio.run, Textual, BleThread) is a uvloop
+    if _HAS_UVLOOP:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     # Validate --node argument
-    if args.node.upper() != "ALL" and not (args.node.isdigit() and 0 <= int(args.node) <= 9):
+    if not _NODE_RE.fullmatch(args.node.upper()):
         parser.error(f"Invalid node ID '{args.node}': use 0-9 or ALL")
 
     node = args.node.upper() if args.node.upper() == "ALL" else args.node
@@ -1794,11 +2643,11 @@ def main():
 
     # If TUI available and not one-shot and not --no-tui, launch TUI
     # Textual's app.run() manages its own event loop, so call it directly (not from asyncio.run)
-    if _HAS_TEXTUAL and not is_oneshot and not args.no_tui:
-        gateway = DCMonitorGateway()
+    if not is_oneshot and not args.no_tui and _import_textual():
+        gateway = DCMonitorGateway(coalesce=args.coalesce)
         app = MeshGatewayApp(
             gateway,
-            target_address=args.address,
+            target_address=args.address[0] if args.address else None,
             default_node=node,
             scan_timeout=args.timeout,
         )
@@ -1811,14 +2660,19 @@ def main():
 
 async def _run_cli(args, node: str):
     """Run one-shot CLI commands or legacy interactive mode."""
-    gateway = DCMonitorGateway()
+    gateway = DCMonitorGateway(coalesce=args.coalesce)
 
     print("\n" + "=" * 50)
     print("  DC Monitor Mesh Gateway (Pi 5)")
     print("=" * 50)
 
+    # One-shot commands don't need the mesh size, so --address can end the scan early
+    addresses = args.address or []
+    quick = args.stop or args.ramp or args.status or args.read or args.duty is not None
     devices = await gateway.scan_for_nodes(
-        timeout=args.timeout, target_address=args.address
+        timeout=args.timeout,
+        target_address=addresses[0] if len(addresses) == 1 else addresses,
+        stop_on_target=quick,
     )
 
     if args.scan:
@@ -1828,51 +2682,71 @@ async def _run_cli(args, node: str):
     if not devices:
         return
 
-    # Select device
-    if args.address:
-        device = next(
-            (d for d in devices if d.address.upper() == args.address.upper()),
-            devices[0],
-        )
-    else:
-        device = devices[0]
+    # Select device(s): one per --address, falling back to the first one found
+    wanted = {a.upper() for a in addresses}
+    chosen = [d for d in devices if d.address.upper() in wanted] or devices[:1]
 
-    # Connect
-    if not await gateway.connect_to_node(device):
+    # Connect (one gateway object per device, all at once)
+    gateways = [gateway] + [DCMonitorGateway(coalesce=args.coalesce) for _ in chosen[1:]]
+    results = await asyncio.gather(
+        *(gw.connect_to_node(d) for gw, d in zip(gateways, chosen))
+    )
+    gateways = [gw for gw, ok in zip(gateways, results) if ok]
+    if not gateways:
         return
 
     # Derive sensing node count
-    gateway.sensing_node_count = max(0, len(devices) - 1)
+    for gw in gateways:
+        gw.sensing_node_count = max(0, len(devices) - 1)
 
     # Auto-discover mesh nodes
     print("  Auto-discovering mesh nodes...")
     await asyncio.sleep(1.0)
-    await gateway.send_to_node("ALL", "READ", _silent=True)
+    await asyncio.gather(*(gw.send_to_node("ALL", "READ", _silent=True) for gw in gateways))
     await asyncio.sleep(3.0)
 
+    if len(gateways) > 1 and not (quick or args.monitor):
+        # Interactive mode drives a single gateway
+        print("  Interactive mode uses the first gateway only")
+        await asyncio.gather(*(gw.disconnect() for gw in gateways[1:]))
+        gateways = gateways[:1]
+
+    try:
+        await asyncio.gather(*(_run_gateway(gw, args, node) for gw in gateways))
+    except asyncio.CancelledError:
+        # Ctrl+C in monitor mode cancels the gather too; still disconnect cleanly
+        pass
+    await asyncio.gather(*(gw.disconnect() for gw in gateways))
+
+
+async def _run_gateway(gateway: DCMonitorGateway, args, node: str):
+    """Run the requested CLI action against one connected gateway."""
     # Handle one-shot CLI commands
+    # (each returns as soon as the node answers; the timeout is the old padding)
+    ops = []
     if args.stop:
-        await gateway.stop_node(node)
-        await asyncio.sleep(1)
-    elif args.duty is not None:
-        await gateway.set_duty(node, args.duty)
-        await asyncio.sleep(2)
-    elif args.ramp:
-        await gateway.start_ramp(node)
-        await asyncio.sleep(2)
-    elif args.status:
-        await gateway.read_status(node)
-        await asyncio.sleep(2)
-    elif args.read:
-        await gateway.read_sensor(node)
-        await asyncio.sleep(2)
+        ops.append(gateway.stop_node(node))
+    if args.duty is not None:
+        ops.append(gateway.set_duty(node, args.duty))
+    if args.ramp:
+        ops.append(gateway.start_ramp(node))
+    if args.status:
+        ops.append(gateway.read_status(node))
+    if args.read:
+        ops.append(gateway.read_sensor(node))
+    if len(ops) > 1:
+        # Several flags at once (e.g. --duty 50 --read): send them together
+        await gateway._run_op(gateway.send_many(ops), node)
+    elif ops:
+        await gateway._run_op(ops[0], node, timeout=1.0 if args.stop else 2.0)
     elif args.monitor:
         await gateway.start_monitor(node)
         print("Monitoring... press Ctrl+C to stop")
         try:
-            while gateway.client and gateway.client.is_connected:
-                await asyncio.sleep(1)
-        except KeyboardInterrupt:
+            await gateway._disconnected.wait()
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            # asyncio.run() turns Ctrl+C into a cancel of this single pending wait;
+            # swallow it so we still fall through to a clean disconnect
             pass
     else:
         # Legacy interactive mode (--no-tui)
@@ -1884,8 +2758,6 @@ async def _run_cli(args, node: str):
             gateway._dashboard_polling = False
             poll_task.cancel()
 
-    await gateway.disconnect()
-
 
 if __name__ == "__main__":
     try: